@@ -1,10 +1,14 @@
 import os
+import time
+from functools import partial
+
 from openai import OpenAI
 
 if os.getenv('PRODUCTION'):
     client = OpenAI(
         api_key=os.getenv('OPENAI_API_KEY'),
-        base_url=os.getenv('OPENAI_BASE_URL')
+        base_url=os.getenv('OPENAI_BASE_URL'),
+        max_retries=0,  # 重试统一由 summarizer 负责
     )
 else:
     from dotenv import find_dotenv, load_dotenv
@@ -13,11 +17,26 @@ else:
     assert os.getenv('OPENAI_API_KEY')
     assert os.getenv('OPENAI_BASE_URL')
     
-    client = OpenAI()
+    client = OpenAI(max_retries=0)
 
 import streamlit as st
 import pandas as pd
-import ell
+
+from cache import SummaryCache, summary_key
+from dedup import PaperIndex, count_saved_calls, summarize_unique
+from jobs import get_job, make_job_id
+from journals import JOURNAL_LISTS, build_query, journal_mask
+from metrics import Metrics
+from search import SearchIndex, update_index
+from summarizer import (
+    BATCH_PROMPT,
+    MAX_BATCH_SIZE,
+    SUMMARY_PROMPT,
+    get_model_limits,
+    make_batch_summarizer,
+    make_summarizer,
+    summarize_rows,
+)
 
 
 st.set_page_config(page_title="速读文献摘要", 
@@ -39,6 +58,26 @@ MODEL_NAME = st.sidebar.selectbox(
     ]
 )
 
+# 并发设置
+limits = get_model_limits(MODEL_NAME)
+CONCURRENCY = st.sidebar.number_input("并发请求数", min_value=1, max_value=64,
+                                      value=limits["concurrency"], key=f"concurrency_{MODEL_NAME}")
+RPM = st.sidebar.number_input("每分钟请求上限 (0 为不限)", min_value=0,
+                              value=limits["rpm"], key=f"rpm_{MODEL_NAME}")
+TEMPERATURE = 0.5
+
+# 批量模式：多篇文章合并为一次请求
+BATCH_MODE = st.sidebar.checkbox("批量模式（多篇合并请求）", value=False)
+BATCH_SIZE = st.sidebar.number_input("每批最多篇数", min_value=2, max_value=50,
+                                     value=MAX_BATCH_SIZE, disabled=not BATCH_MODE)
+
+# 总结缓存
+FORCE_REFRESH = st.sidebar.checkbox("强制刷新（忽略缓存）", value=False)
+cache_stats = st.sidebar.empty()
+
+# 请求性能指标
+metrics_panel = st.sidebar.empty()
+
 
 # # 设置环境变量
 # if OPENAI_API_KEY:
@@ -48,101 +87,296 @@ MODEL_NAME = st.sidebar.selectbox(
 #     os.environ['OPENAI_BASE_URL'] = OPENAI_BASE_URL
 
 
-# 初始化ell客户端
-# ell.init(store='./logdir', autocommit=True, verbose=False)
-
 
 @st.cache_data
 def load_csv(file):
     return pd.read_csv(file)
 
 
-page = st.sidebar.selectbox("功能", ["速读文献摘要", "检索式"])
+@st.cache_resource
+def get_summary_cache():
+    return SummaryCache()
+
+
+def show_cache_stats(cache):
+    cache_stats.caption(f"缓存命中: {cache.hits} | 未命中: {cache.misses} | 条目数: {len(cache)}")
+
+
+@st.cache_resource
+def get_paper_index():
+    # 键表与已完成的总结保存在 logdir/paper_index.db，重启后及 reftool 处理过的文件都能复用
+    return PaperIndex()
+
+
+@st.cache_resource
+def get_metrics():
+    return Metrics()
+
+
+@st.cache_resource
+def get_search_index():
+    return SearchIndex()
+
+
+@st.cache_resource
+def get_indexed_jobs():
+    # 任务 ID -> 已写入检索索引的行数
+    return {}
+
+
+def format_seconds(value):
+    return "-" if value is None else f"{value:.2f}s"
+
+
+def show_metrics(metrics):
+    summary = metrics.summary()
+    if summary is None:
+        metrics_panel.caption("暂无请求记录")
+        return
+    metrics_panel.markdown(
+        "| 请求耗时 | p50 | p95 |\n"
+        "| --- | --- | --- |\n"
+        + "".join(
+            f"| {label} | {format_seconds(summary[f'{field}_p50'])} | {format_seconds(summary[f'{field}_p95'])} |\n"
+            for label, field in [("排队", "queue_wait"), ("首 token", "ttft"), ("总耗时", "latency")]
+        )
+        + f"\n吞吐量 {summary['rows_per_min']:.1f} 行/分钟，请求 {summary['requests']} 次，"
+        f"重试 {summary['retries']} 次，失败 {summary['errors']} 次，"
+        f"token {summary['prompt_tokens']} / {summary['completion_tokens']}"
+    )
+
+
+summary_cache = get_summary_cache()
+show_cache_stats(summary_cache)
+paper_index = get_paper_index()
+metrics = get_metrics()
+show_metrics(metrics)
+search_index = get_search_index()
+
+
+# 导出请求性能指标，点击后才生成 CSV；放在页面分支之前，任务渲染循环运行时也能使用
+if st.sidebar.button("导出性能指标"):
+    st.sidebar.download_button("下载性能指标 CSV", metrics.to_csv(), file_name="metrics.csv", mime="text/csv")
+
+
+page = st.sidebar.selectbox("功能", ["速读文献摘要", "文献检索", "检索式"])
 
 if page == "速读文献摘要":
     if not MODEL_NAME:
         st.warning("请设置模型")
     else:    
-        @ell.simple(model=MODEL_NAME, client=client, temperature=0.5)
-        def summary_article_by_abstract(title: str, abstract: str):
-            """你是一名IS领域的教授。请根据学生发送的文章题目和摘要，帮助总结文章的内容。要求：不要产生幻觉；使用中文；你需要返回字符串格式的总结的内容；"""
-            return f"文章名称：{title}；\n文章摘要：{abstract}；"
+        summary_article_by_abstract = make_summarizer(client, MODEL_NAME, temperature=TEMPERATURE)
+        summary_articles_in_batch = make_batch_summarizer(client, MODEL_NAME, temperature=TEMPERATURE)
 
         # Streamlit 页面布局
         st.title("速读文献摘要")
         st.write("请上传 Scopus 导出的包含文章标题和摘要的 CSV 文件")
 
-        # 初始化 session state
-        if 'process_clicked' not in st.session_state:
-            st.session_state.process_clicked = False
-
         # 文件上传
         uploaded_file = st.file_uploader("上传 CSV 文件", type=["csv"])
 
         if uploaded_file is not None:
-            # 处理按钮
-            if st.button("处理文件"):
-                st.session_state.process_clicked = True
-            
-                # 读取 CSV 文件并缓存
-                df = load_csv(uploaded_file)
-
-                # 检查数据框是否包含正确的列
-                if '文献标题' in df.columns and '摘要' in df.columns:
-                    total_rows = len(df)
+            # 读取 CSV 文件并缓存
+            df = load_csv(uploaded_file)
+
+            # 按期刊列表筛选，只总结目标期刊的文章
+            journal_filter = st.selectbox("期刊列表筛选", ["不筛选"] + list(JOURNAL_LISTS))
+            if journal_filter != "不筛选":
+                if '来源出版物名称' in df.columns:
+                    mask = journal_mask(df['来源出版物名称'], journal_filter)
+                    st.caption(f"{journal_filter.upper()} 期刊：{mask.sum()}/{len(df)} 行")
+                    df = df[mask].reset_index(drop=True)
+                else:
+                    st.warning("CSV 文件缺少 '来源出版物名称' 列，无法按期刊筛选")
+
+            # 检查数据框是否包含正确的列
+            if '文献标题' in df.columns and '摘要' in df.columns:
+                total_rows = len(df)
+                rows = [
+                    (i, row['文献标题'], row['摘要'])
+                    for i, (_, row) in enumerate(df.iterrows())
+                ]
+
+                # 每个上传文件对应一个任务，结果写入检查点，脚本重跑后重新挂接
+                job = get_job(make_job_id(uploaded_file.getvalue(), MODEL_NAME, journal_filter))
+                # 后台线程仍在写入结果，先取已完成行，再取结果快照（快照只会更多）
+                completed = job.completed
+                results = job.snapshot()
+                st.caption(f"任务 ID: {job.job_id}（已完成 {len(completed)}/{total_rows}）")
+
+                # 去重：按 DOI / EID / 标题 / MinHash 识别同一文献，跨上传文件只总结一次
+                paper_keys = paper_index.add(make_job_id(uploaded_file.getvalue(), journal_filter), df)
+                paper_summaries = paper_index.summaries_for(MODEL_NAME)
+                for i in completed:
+                    paper_summaries.setdefault(paper_keys[i], results[i]["summary"])
+                pending_rows = [row for row in rows if row[0] not in completed]
+                saved_calls = count_saved_calls(pending_rows, paper_keys, paper_summaries, refresh=FORCE_REFRESH)
+                if saved_calls:
+                    st.info(f"去重：{len(pending_rows)} 行待处理，其中 {saved_calls} 行是重复或已总结过的文献，"
+                            f"节省 {saved_calls} 次 LLM 调用")
+
+                col_start, col_reset = st.columns(2)
+                # 处理按钮：开始任务，或从上次中断处继续
+                if col_start.button("处理文件"):
+                    run = partial(
+                        summarize_rows, summary_article_by_abstract,
+                        concurrency=CONCURRENCY, rpm=RPM or None,
+                        cache=summary_cache,
+                        key_of=partial(summary_key, MODEL_NAME, SUMMARY_PROMPT, TEMPERATURE),
+                        batch_key_of=partial(summary_key, MODEL_NAME, BATCH_PROMPT, TEMPERATURE),
+                        refresh=FORCE_REFRESH,
+                        batch_summarize=summary_articles_in_batch if BATCH_MODE else None,
+                        context_tokens=limits["context"],
+                        max_batch_size=BATCH_SIZE,
+                        metrics=metrics,
+                        on_token=job.stream,
+                    )
+                    job.start(rows, partial(summarize_unique, run, keys=paper_keys,
+                                            summaries=paper_summaries, refresh=FORCE_REFRESH))
+                if col_reset.button("清空任务记录", disabled=job.running):
+                    job.reset()
+
+                if job.running or job.results:
                     progress_bar = st.progress(0)
                     progress_text = st.empty()  # 用于显示当前进度
-                    summaries = []  # 用于存储总结内容
-                    
+
                     st.markdown("### 生成总结")
-                    for index, row in df.iterrows():
-                        title = row['文献标题']
-                        abstract = row['摘要']
-                        summary = summary_article_by_abstract(title, abstract)
-                        
-                        # 创建一个可选择的block
-                        with st.expander(f"{title}", expanded=True):
-                            st.markdown(f"[文章链接]({row['链接']})")
-                            st.write(f"{summary}")
-
-                        summaries.append(
+                    # 分页展示，只渲染当前页的文章
+                    col_view, col_size, col_page = st.columns(3)
+                    view = col_view.radio("展示方式", ["卡片", "表格"], horizontal=True)
+                    page_size = col_size.selectbox("每页篇数", [10, 20, 50, 100], index=1)
+                    page_count = max(1, -(-total_rows // page_size))
+                    page_number = col_page.number_input("页码", min_value=1, max_value=page_count, value=1)
+                    visible = range((page_number - 1) * page_size, min(page_number * page_size, total_rows))
+
+                    # 预先按行顺序占位，生成中的总结逐字填入，完成后替换为最终结果
+                    if view == "卡片":
+                        placeholders = {i: st.empty() for i in visible}
+                    else:
+                        table = st.empty()
+                    rendered = {}
+                    while True:
+                        running = job.running
+                        changed = False
+                        for i in visible:
+                            record = job.results.get(i)
+                            state = record if record is not None else job.partial.get(i)
+                            if state is None or rendered.get(i) is state:
+                                continue
+                            rendered[i] = state
+                            changed = True
+                            if view != "卡片":
+                                continue
+
+                            # 创建一个可选择的block
+                            with placeholders[i].container():
+                                with st.expander(f"{rows[i][1]}", expanded=True):
+                                    st.markdown(f"[文章链接]({df.iloc[i]['链接']})")
+                                    if record is None:
+                                        st.write(f"{state}▌")
+                                    elif record["error"] is not None:
+                                        st.error(f"总结失败: {record['error']}")
+                                    else:
+                                        st.write(f"{record['summary']}")
+
+                        if view == "表格" and changed:
+                            table.dataframe(pd.DataFrame([
+                                {
+                                    "title": rows[i][1],
+                                    "summary": state["summary"] if isinstance(state, dict) else f"{state}▌",
+                                }
+                                for i, state in sorted(rendered.items())
+                            ]), use_container_width=True)
+
+                        done = len(job.results)
+                        # 更新进度条
+                        progress_bar.progress(done / total_rows)
+                        # 更新进度文本
+                        progress_text.text(f"处理进度: {done}/{total_rows}")
+
+                        show_metrics(metrics)
+
+                        if not running:
+                            break
+                        time.sleep(0.5)
+
+                    if job.error is not None:
+                        st.error(f"任务中断: {job.error}，可再次点击“处理文件”继续")
+                    show_cache_stats(summary_cache)
+
+                    # 新完成的总结增量写入检索索引
+                    indexed_jobs = get_indexed_jobs()
+                    completed = job.completed
+                    results = job.snapshot()
+                    if not job.running and indexed_jobs.get(job.job_id) != len(completed):
+                        search_index.add_papers(
                             {
-                                "title": title,
-                                "summary": summary,
+                                "title": df.iloc[i]['文献标题'],
+                                "abstract": df.iloc[i]['摘要'],
+                                "summary": results[i]["summary"],
+                                "year": df.iloc[i].get('年份'),
+                                "source": df.iloc[i].get('来源出版物名称'),
+                                "link": df.iloc[i].get('链接'),
+                                "file": os.path.splitext(uploaded_file.name)[0],
                             }
+                            for i in sorted(completed)
                         )
-                        
-                        # 更新进度条
-                        progress_bar.progress((index + 1) / total_rows)
-                        # 更新进度文本
-                        progress_text.text(f"处理进度: {index + 1}/{total_rows}")
-                
-                    st.markdown("### JSON 格式的总结内容")
-                    st.json(summaries)
-                    st.markdown("### DataFrame 格式的总结内容")
-                    st.dataframe(pd.DataFrame(summaries))
-                
-                else:
-                    st.error("CSV 文件应包含 '文献标题' 和 '摘要' 两列。")
+                        indexed_jobs[job.job_id] = len(completed)
+
+                    # 下载文件只在需要时生成，不随页面一起发送
+                    st.markdown("### 下载总结内容")
+                    col_format, col_export = st.columns(2)
+                    export_format = col_format.selectbox("格式", ["json", "csv", "parquet"])
+                    if col_export.button("生成下载文件", disabled=job.running):
+                        st.download_button(
+                            f"下载 {export_format.upper()}",
+                            job.export(export_format),
+                            file_name=f"{os.path.splitext(uploaded_file.name)[0]}_summary.{export_format}",
+                        )
+
+            else:
+                st.error("CSV 文件应包含 '文献标题' 和 '摘要' 两列。")
+elif page == "文献检索":
+    st.title("文献检索")
+
+    # 增量更新：只处理新增或修改过的 CSV、总结文件和任务检查点
+    if st.button("更新索引"):
+        changed, elapsed = update_index(search_index)
+        st.caption(f"更新了 {changed} 个文件，用时 {elapsed:.2f}s")
+
+    index_stats = search_index.stats()
+    if not index_stats["papers"]:
+        st.info("索引为空，请先点击“更新索引”")
+    else:
+        st.caption(f"已索引 {index_stats['papers']} 篇文献")
+
+        query = st.text_input("检索词（支持中英文）")
+        col_year, col_limit = st.columns([3, 1])
+        # 只有缩小年份区间时才按年份筛选，缺少年份的文献默认也会返回
+        year_range = None
+        if index_stats["year_min"] is not None:
+            full_range = (index_stats["year_min"], max(index_stats["year_max"], index_stats["year_min"] + 1))
+            selected_years = col_year.slider("年份", *full_range, full_range)
+            if selected_years != full_range:
+                year_range = selected_years
+        limit = col_limit.selectbox("结果数", [20, 50, 100])
+        sources = st.multiselect("来源出版物", index_stats["sources"])
+
+        if query:
+            start = time.time()
+            results = search_index.search(query, limit=limit, year_range=year_range, sources=sources)
+            st.caption(f"找到 {len(results)} 条结果，用时 {(time.time() - start) * 1000:.0f} ms")
+            for _, result in results.iterrows():
+                year = "" if pd.isna(result['year']) else f"（{int(result['year'])}）"
+                with st.expander(f"{result['title']}{year}", expanded=True):
+                    st.markdown(f"{result['source']} · [文章链接]({result['link']})")
+                    if result["summary"]:
+                        st.write(result["summary"])
+                    else:
+                        st.write(result["abstract"])
 elif page == "检索式":
     st.title("检索式")
 
-    content = {
-        "utd": {
-            "wos": """SO=("The Accounting Review" OR "Journal of Accounting and Economics" OR "Journal of Accounting Research" OR "Journal of Finance" OR "Journal of Financial Economics" OR "The Review of Financial Studies" OR "Information Systems Research" OR "Journal on Computing" OR "MIS Quarterly" OR "Journal of Consumer Research" OR "Journal of Marketing" OR "Journal of Marketing Research" OR "Marketing Science" OR "Management Science" OR "Operations Research" OR "Journal of Operations Management" OR "Manufacturing and Service Operations Management" OR "Production and Operations Management" OR "Academy of Management Journal" OR "Academy of Management Review" OR "Administrative Science Quarterly" OR "Organization Science" OR "Journal of International Business Studies" OR "Strategic Management Journal")""",
-            "scopus": """SRCTITLE ("The Accounting Review" OR "Journal of Accounting and Economics" OR "Journal of Accounting Research" OR "Journal of Finance" OR "Journal of Financial Economics" OR "The Review of Financial Studies" OR "Information Systems Research" OR "Journal on Computing" OR "MIS Quarterly" OR "Journal of Consumer Research" OR "Journal of Marketing" OR "Journal of Marketing Research" OR "Marketing Science" OR "Management Science" OR "Operations Research" OR "Journal of Operations Management" OR "Manufacturing and Service Operations Management" OR "Production and Operations Management" OR "Academy of Management Journal" OR "Academy of Management Review" OR "Administrative Science Quarterly" OR "Organization Science" OR "Journal of International Business Studies" OR "Strategic Management Journal")""",
-        
-        },
-        "ft": {
-            "wos": """SO=("Academy of Management Journal" OR "Academy of Management Review" OR "Accounting, Organizations and Society" OR "Administrative Science Quarterly" OR "American Economic Review" OR "Contemporary Accounting Research" OR "Econometrica" OR "Entrepreneurship Theory and Practice" OR "Harvard Business Review" OR "Human Relations" OR "Human Resource Management" OR "Information Systems Research" OR "Journal of Accounting and Economics" OR "Journal of Accounting Research" OR "Journal of Applied Psychology" OR "Journal of Business Ethics" OR "Journal of Business Venturing" OR "Journal of Consumer Psychology" OR "Journal of Consumer Research" OR "Journal of Finance" OR "Journal of Financial and Quantitative Analysis" OR "Journal of Financial Economics" OR "Journal of International Business Studies" OR "Journal of Management" OR "Journal of Management Information Systems" OR "Journal of Management Studies" OR "Journal of Marketing" OR "Journal of Marketing Research" OR "Journal of Operations Management" OR "Journal of Political Economy" OR "Journal of the Academy of Marketing Science" OR "Management Science" OR "Manufacturing and Service Operations Management" OR "Marketing Science" OR "MIS Quarterly" OR "Operations Research" OR "Organization Science" OR "Organization Studies" OR "Organizational Behavior and Human Decision Processes" OR "Production and Operations Management" OR "Quarterly Journal of Economics" OR "Research Policy" OR "Review of Accounting Studies" OR "Review of Economic Studies" OR "Review of Finance" OR "Review of Financial Studies" OR "Sloan Management Review" OR "Strategic Entrepreneurship Journal" OR "Strategic Management Journal" OR "The Accounting Review" OR "Journal of Computing")""",
-            "scopus": """SRCTITLE SO=("Academy of Management Journal" OR "Academy of Management Review" OR "Accounting, Organizations and Society" OR "Administrative Science Quarterly" OR "American Economic Review" OR "Contemporary Accounting Research" OR "Econometrica" OR "Entrepreneurship Theory and Practice" OR "Harvard Business Review" OR "Human Relations" OR "Human Resource Management" OR "Information Systems Research" OR "Journal of Accounting and Economics" OR "Journal of Accounting Research" OR "Journal of Applied Psychology" OR "Journal of Business Ethics" OR "Journal of Business Venturing" OR "Journal of Consumer Psychology" OR "Journal of Consumer Research" OR "Journal of Finance" OR "Journal of Financial and Quantitative Analysis" OR "Journal of Financial Economics" OR "Journal of International Business Studies" OR "Journal of Management" OR "Journal of Management Information Systems" OR "Journal of Management Studies" OR "Journal of Marketing" OR "Journal of Marketing Research" OR "Journal of Operations Management" OR "Journal of Political Economy" OR "Journal of the Academy of Marketing Science" OR "Management Science" OR "Manufacturing and Service Operations Management" OR "Marketing Science" OR "MIS Quarterly" OR "Operations Research" OR "Organization Science" OR "Organization Studies" OR "Organizational Behavior and Human Decision Processes" OR "Production and Operations Management" OR "Quarterly Journal of Economics" OR "Research Policy" OR "Review of Accounting Studies" OR "Review of Economic Studies" OR "Review of Finance" OR "Review of Financial Studies" OR "Sloan Management Review" OR "Strategic Entrepreneurship Journal" OR "Strategic Management Journal" OR "The Accounting Review" OR "Journal of Computing")""",
-        },
-        "tjsem": {
-            "wos": """SO=("Academy of Management Journal" OR "Academy of Management Review" OR "Administrative Science Quarterly" OR "American Economic Review" OR "Econometrica" OR "Information Systems Research" OR "Journal of Accounting and Economics" OR "Journal of Accounting Research" OR "Journal of Consumer Research" OR "Journal of Finance" OR "Journal of Financial Economics" OR "Journal of International Business Studies" OR "Journal of Marketing" OR "Journal of Marketing Research" OR "Journal of Operations Management" OR "Journal of Political Economy" OR "Management Information Systems Quarterly" OR "Management Science" OR "Manufacturing & Service Operations Management" OR "Marketing Science" OR "Operations Research" OR "Organization Science" OR "Production and Operations Management" OR "Quarterly Journal of Economics" OR "Review of Economic Studies" OR "Review of Financial Studies" OR "Strategic Management Journal" OR "The Accounting Review" OR "Accounting, Organizations and Society" OR "American Economic Journal: Applied Economics" OR "American Economic Journal: Macroeconomics" OR "American Economic Journal: Microeconomics" OR "American Journal of Agricultural Economics" OR "Contemporary Accounting Research" OR "Entrepreneurship Theory and Practice" OR "Global Environmental Change-Human and Policy Dimensions" OR "Human Resource Management" OR "IEEE Transactions on Automatic Control" OR "International Economic Review" OR "Journal of Applied Psychology" OR "Journal of Business Venturing" OR "Journal of Consumer Psychology" OR "Journal of Development Economics" OR "Journal of Economic Literature" OR "Journal of Economic Theory" OR "Journal of Financial and Quantitative Analysis" OR "Journal of International Economics" OR "Journal of Labor Economics" OR "Journal of Management" OR "Journal of Management Information Systems" OR "Journal of Management Studies" OR "Journal of Monetary Economics" OR "Journal of Public Administration: Research and Theory" OR "Journal of Public Economics" OR "Journal of the Academy of Marketing Science" OR "Journal of Urban Economics" OR "Journal on Computing" OR "Mathematical Programming" OR "Organization Studies" OR "Organizational Behaviour and Human Decision Processes" OR "Personnel Psychology" OR "Policy Studies Journal" OR "Public Administration Review" OR "Public Administration: An International Quarterly" OR "Rand Journal of Economics" OR "Regional Studies" OR "Research Policy" OR "Review of Accounting Studies" OR "Review of Finance" OR "Strategic Entrepreneurship Journal" OR "The Journal of Law and Economics" OR "The Review of Economics and Statistics" OR "Transportation Research Part B: Methodological" OR "Transportation Science" OR "World Development" OR "Abacus-A Journal of Accounting Finance and Business Studies" OR "Academy of Management Perspectives" OR "Accounting and Business Research" OR "Accounting Horizons" OR "American Economic Journal: Economic Policy" OR "American Journal of Sociology" OR "American Review of Public Administration" OR "Annals of Statistics" OR "Asia Pacific Journal of Management" OR "Auditing: A Journal of Practice & Theory" OR "Automation in Construction" OR "British Journal of Management" OR "Business Ethics Quarterly" OR "California Management Review" OR "Canadian Journal of Economics" OR "Computers & Operations Research" OR "Decision Sciences" OR "Decision Support Systems" OR "Ecological Economics" OR "Econometric Theory" OR "Economic Development and Cultural Change" OR "Economic Inquiry" OR "Economic Journal" OR "Economica" OR "Economics Letters" OR "Energy Economics" OR "Energy Journal" OR "Environmental & Resource Economics" OR "European Economic Review" OR "European Journal of Information Systems" OR "European Journal of Operational Research" OR "Experimental Economics" OR "Financial Management" OR "Food Policy" OR "Games and Economic Behavior" OR "Governance–An International Journal of Policy Administration and Institutions" OR "Harvard Business Review" OR "Health Services Research" OR "Human Relations" OR "IEEE Transactions on Engineering Management" OR "IISE Transactions" OR "Industrial Marketing Management" OR "Industrial Relations" OR "Information and Management" OR "International Journal of Human Resource Management" OR "International Journal of Production Economics" OR "International Journal of Project Management" OR "International Journal of Research in Marketing" OR "International Small Business Journal" OR "Journal of Accounting and Public Policy" OR "Journal of Accounting, Auditing and Finance" OR "Journal of Advertising" OR "Journal of Banking & Finance" OR "Journal of Business & Economic Statistics" OR "Journal of Business Ethics" OR "Journal of Business Finance & Accounting" OR "Journal of Comparative Economics" OR "Journal of Construction Engineering and Management" OR "Journal of Corporate Finance" OR "Journal of Econometrics" OR "Journal of Economic Behavior & Organization" OR "Journal of Economic Dynamics & Control" OR "Journal of Economic Geography" OR "Journal of Economic Growth" OR "Journal of Economic Perspectives" OR "Journal of Empirical Finance" OR "Journal of Environmental Economics and Management" OR "Journal of European Public Policy" OR "Journal of Financial Intermediation" OR "Journal of Financial Markets" OR "Journal of Futures Markets" OR "Journal of Health Economics" OR "Journal of Industrial Economics" OR "Journal of Interactive Marketing" OR "Journal of International Money and Finance" OR "Journal of Money, Credit and Banking" OR "Journal of Occupational and Organizational Psychology" OR "Journal of Organizational Behavior" OR "Journal of Policy Analysis and Management" OR "Journal of Product Innovation Management" OR "Journal of Real Estate Finance and Economics" OR "Journal of Regional Science" OR "Journal of Retailing" OR "Journal of Risk and Uncertainty" OR "Journal of Scheduling" OR "Journal of Service Research" OR "Journal of Social Policy" OR "Journal of the American Statistical Association" OR "Journal of the Association for Information Systems" OR "Journal of the European Economic Association" OR "Journal of Transportation Engineering, Part A: Systems" OR "Journal of Vocational Behavior" OR "Journal of World Business" OR "Labour Economics" OR "Land Economics" OR "Leadership Quarterly" OR "Management Accounting Research" OR "Management and Organization Review" OR "Marketing Letters" OR "Mathematical Finance" OR "Mathematics of Operations Research" OR "MIT Sloan Management Review" OR "Naval Research Logistics" OR "Omega-International Journal of Management Science" OR "Organizational Research Methods" OR "Policy and Politics" OR "Psychology & Marketing" OR "Public Management Review" OR "R & D Management" OR "Real Estate Economics" OR "Regional Science & Urban Economics" OR "Regulation and Governance" OR "Review of Economic Dynamics" OR "Risk Analysis" OR "Scandinavian Journal of Economics" OR "Technological Forecasting and Social Change" OR "Technovation" OR "Transportation Research Part A: Policy and Practice" OR "Transportation Research Part E: Logistics and Transportation Review" OR "Accounting and Finance" OR "ACM Transactions on Information Systems" OR "Agricultural Economics" OR "Annals of Operations Research" OR "Applied Economics" OR "Asia Pacific Journal of Human Resources" OR "B E Journal of Macroeconomics" OR "British Journal of Industrial Relations" OR "Business & Society" OR "China Economic Review" OR "Econometric Reviews" OR "Economic Modelling" OR "Economics of Education Review" OR "Entrepreneurship & Regional Development" OR "European Accounting Review" OR "European Journal of Work and Organizational Psychology" OR "Family Business Review" OR "Financial Analysts Journal" OR "Health Economics" OR "Human Resource Management Journal" OR "ILR Review" OR "Information Systems Journal" OR "Insurance: Mathematics and Economics" OR "International Business Review" OR "International Journal of Advertising" OR "International Journal of Electronic Commerce" OR "International Journal of Forecasting" OR "International Journal of Market Research" OR "International Journal of Production Research" OR "Journal of Agricultural Economics" OR "Journal of Business Research" OR "Journal of Derivatives" OR "Journal of Economic Psychology" OR "Journal of Economics & Management Strategy" OR "Journal of Financial Research" OR "Journal of Management Accounting Research" OR "Journal of Management in Engineering" OR "Journal of Managerial Psychology" OR "Journal of Optimization Theory and Applications" OR "Journal of Regulatory Economics" OR "Journal of Risk and Insurance" OR "Journal of Small Business Management" OR "Journal of Strategic Information Systems" OR "Journal of Supply Chain Management" OR "Journal of the American Taxation Association" OR "Journal of the Operational Research Society" OR "Oxford Economic Papers" OR "Oxford Review of Economic Policy" OR "Public Choice" OR "Quantitative Economics" OR "Quantitative Finance" OR "Resource and Energy Economics" OR "Review of Environmental Economics and Policy" OR "Review of Quantitative Finance and Accounting" OR "Service Industries Journal" OR "Supply Chain Management - An International Journal" OR "The International Journal of Accounting")""",
-            "scopus": """SRCTITLE ("Academy of Management Journal" OR "Academy of Management Review" OR "Administrative Science Quarterly" OR "American Economic Review" OR "Econometrica" OR "Information Systems Research" OR "Journal of Accounting and Economics" OR "Journal of Accounting Research" OR "Journal of Consumer Research" OR "Journal of Finance" OR "Journal of Financial Economics" OR "Journal of International Business Studies" OR "Journal of Marketing" OR "Journal of Marketing Research" OR "Journal of Operations Management" OR "Journal of Political Economy" OR "Management Information Systems Quarterly" OR "Management Science" OR "Manufacturing & Service Operations Management" OR "Marketing Science" OR "Operations Research" OR "Organization Science" OR "Production and Operations Management" OR "Quarterly Journal of Economics" OR "Review of Economic Studies" OR "Review of Financial Studies" OR "Strategic Management Journal" OR "The Accounting Review" OR "Accounting, Organizations and Society" OR "American Economic Journal: Applied Economics" OR "American Economic Journal: Macroeconomics" OR "American Economic Journal: Microeconomics" OR "American Journal of Agricultural Economics" OR "Contemporary Accounting Research" OR "Entrepreneurship Theory and Practice" OR "Global Environmental Change-Human and Policy Dimensions" OR "Human Resource Management" OR "IEEE Transactions on Automatic Control" OR "International Economic Review" OR "Journal of Applied Psychology" OR "Journal of Business Venturing" OR "Journal of Consumer Psychology" OR "Journal of Development Economics" OR "Journal of Economic Literature" OR "Journal of Economic Theory" OR "Journal of Financial and Quantitative Analysis" OR "Journal of International Economics" OR "Journal of Labor Economics" OR "Journal of Management" OR "Journal of Management Information Systems" OR "Journal of Management Studies" OR "Journal of Monetary Economics" OR "Journal of Public Administration: Research and Theory" OR "Journal of Public Economics" OR "Journal of the Academy of Marketing Science" OR "Journal of Urban Economics" OR "Journal on Computing" OR "Mathematical Programming" OR "Organization Studies" OR "Organizational Behaviour and Human Decision Processes" OR "Personnel Psychology" OR "Policy Studies Journal" OR "Public Administration Review" OR "Public Administration: An International Quarterly" OR "Rand Journal of Economics" OR "Regional Studies" OR "Research Policy" OR "Review of Accounting Studies" OR "Review of Finance" OR "Strategic Entrepreneurship Journal" OR "The Journal of Law and Economics" OR "The Review of Economics and Statistics" OR "Transportation Research Part B: Methodological" OR "Transportation Science" OR "World Development" OR "Abacus-A Journal of Accounting Finance and Business Studies" OR "Academy of Management Perspectives" OR "Accounting and Business Research" OR "Accounting Horizons" OR "American Economic Journal: Economic Policy" OR "American Journal of Sociology" OR "American Review of Public Administration" OR "Annals of Statistics" OR "Asia Pacific Journal of Management" OR "Auditing: A Journal of Practice & Theory" OR "Automation in Construction" OR "British Journal of Management" OR "Business Ethics Quarterly" OR "California Management Review" OR "Canadian Journal of Economics" OR "Computers & Operations Research" OR "Decision Sciences" OR "Decision Support Systems" OR "Ecological Economics" OR "Econometric Theory" OR "Economic Development and Cultural Change" OR "Economic Inquiry" OR "Economic Journal" OR "Economica" OR "Economics Letters" OR "Energy Economics" OR "Energy Journal" OR "Environmental & Resource Economics" OR "European Economic Review" OR "European Journal of Information Systems" OR "European Journal of Operational Research" OR "Experimental Economics" OR "Financial Management" OR "Food Policy" OR "Games and Economic Behavior" OR "Governance–An International Journal of Policy Administration and Institutions" OR "Harvard Business Review" OR "Health Services Research" OR "Human Relations" OR "IEEE Transactions on Engineering Management" OR "IISE Transactions" OR "Industrial Marketing Management" OR "Industrial Relations" OR "Information and Management" OR "International Journal of Human Resource Management" OR "International Journal of Production Economics" OR "International Journal of Project Management" OR "International Journal of Research in Marketing" OR "International Small Business Journal" OR "Journal of Accounting and Public Policy" OR "Journal of Accounting, Auditing and Finance" OR "Journal of Advertising" OR "Journal of Banking & Finance" OR "Journal of Business & Economic Statistics" OR "Journal of Business Ethics" OR "Journal of Business Finance & Accounting" OR "Journal of Comparative Economics" OR "Journal of Construction Engineering and Management" OR "Journal of Corporate Finance" OR "Journal of Econometrics" OR "Journal of Economic Behavior & Organization" OR "Journal of Economic Dynamics & Control" OR "Journal of Economic Geography" OR "Journal of Economic Growth" OR "Journal of Economic Perspectives" OR "Journal of Empirical Finance" OR "Journal of Environmental Economics and Management" OR "Journal of European Public Policy" OR "Journal of Financial Intermediation" OR "Journal of Financial Markets" OR "Journal of Futures Markets" OR "Journal of Health Economics" OR "Journal of Industrial Economics" OR "Journal of Interactive Marketing" OR "Journal of International Money and Finance" OR "Journal of Money, Credit and Banking" OR "Journal of Occupational and Organizational Psychology" OR "Journal of Organizational Behavior" OR "Journal of Policy Analysis and Management" OR "Journal of Product Innovation Management" OR "Journal of Real Estate Finance and Economics" OR "Journal of Regional Science" OR "Journal of Retailing" OR "Journal of Risk and Uncertainty" OR "Journal of Scheduling" OR "Journal of Service Research" OR "Journal of Social Policy" OR "Journal of the American Statistical Association" OR "Journal of the Association for Information Systems" OR "Journal of the European Economic Association" OR "Journal of Transportation Engineering, Part A: Systems" OR "Journal of Vocational Behavior" OR "Journal of World Business" OR "Labour Economics" OR "Land Economics" OR "Leadership Quarterly" OR "Management Accounting Research" OR "Management and Organization Review" OR "Marketing Letters" OR "Mathematical Finance" OR "Mathematics of Operations Research" OR "MIT Sloan Management Review" OR "Naval Research Logistics" OR "Omega-International Journal of Management Science" OR "Organizational Research Methods" OR "Policy and Politics" OR "Psychology & Marketing" OR "Public Management Review" OR "R & D Management" OR "Real Estate Economics" OR "Regional Science & Urban Economics" OR "Regulation and Governance" OR "Review of Economic Dynamics" OR "Risk Analysis" OR "Scandinavian Journal of Economics" OR "Technological Forecasting and Social Change" OR "Technovation" OR "Transportation Research Part A: Policy and Practice" OR "Transportation Research Part E: Logistics and Transportation Review" OR "Accounting and Finance" OR "ACM Transactions on Information Systems" OR "Agricultural Economics" OR "Annals of Operations Research" OR "Applied Economics" OR "Asia Pacific Journal of Human Resources" OR "B E Journal of Macroeconomics" OR "British Journal of Industrial Relations" OR "Business & Society" OR "China Economic Review" OR "Econometric Reviews" OR "Economic Modelling" OR "Economics of Education Review" OR "Entrepreneurship & Regional Development" OR "European Accounting Review" OR "European Journal of Work and Organizational Psychology" OR "Family Business Review" OR "Financial Analysts Journal" OR "Health Economics" OR "Human Resource Management Journal" OR "ILR Review" OR "Information Systems Journal" OR "Insurance: Mathematics and Economics" OR "International Business Review" OR "International Journal of Advertising" OR "International Journal of Electronic Commerce" OR "International Journal of Forecasting" OR "International Journal of Market Research" OR "International Journal of Production Research" OR "Journal of Agricultural Economics" OR "Journal of Business Research" OR "Journal of Derivatives" OR "Journal of Economic Psychology" OR "Journal of Economics & Management Strategy" OR "Journal of Financial Research" OR "Journal of Management Accounting Research" OR "Journal of Management in Engineering" OR "Journal of Managerial Psychology" OR "Journal of Optimization Theory and Applications" OR "Journal of Regulatory Economics" OR "Journal of Risk and Insurance" OR "Journal of Small Business Management" OR "Journal of Strategic Information Systems" OR "Journal of Supply Chain Management" OR "Journal of the American Taxation Association" OR "Journal of the Operational Research Society" OR "Oxford Economic Papers" OR "Oxford Review of Economic Policy" OR "Public Choice" OR "Quantitative Economics" OR "Quantitative Finance" OR "Resource and Energy Economics" OR "Review of Environmental Economics and Policy" OR "Review of Quantitative Finance and Accounting" OR "Service Industries Journal" OR "Supply Chain Management - An International Journal" OR "The International Journal of Accounting")""",
-        }
-    }
-
     pattern = {
         "keyword": {
             "wos": """TS=""",
@@ -151,7 +385,7 @@ elif page == "检索式":
     }
 
     # 选择器
-    selected_category = st.selectbox("类别", ["utd", "ft", "tjsem"])
+    selected_category = st.selectbox("类别", list(JOURNAL_LISTS))
     selected_source = st.selectbox("数据库", ["wos", "scopus"])
 
     # 关键词输入框
@@ -165,7 +399,8 @@ elif page == "检索式":
 
     if selected_category and selected_source:
         st.markdown(f"### {selected_category.upper()}")
-        content_to_display = content[selected_category][selected_source]
+        content_to_display = build_query(selected_category, selected_source)
         if keyword_display:
             content_to_display += """ AND """ + keyword_display
         st.code(content_to_display, wrap_lines=True)
+
@@ -0,0 +1,108 @@
+"""用 data/*.csv 回放总结流程，在本地模拟接口上对比顺序、并发与批量模式的吞吐量
+
+用法：
+    python -m bench.benchmark --limit 40 --concurrency 16 --error-rate 0.02
+"""
+import argparse
+import glob
+import time
+
+import pandas as pd
+from openai import OpenAI
+
+from bench.mock_server import MockConfig, start_server
+from metrics import Metrics
+from summarizer import (
+    MAX_BATCH_SIZE,
+    get_model_limits,
+    make_batch_summarizer,
+    make_summarizer,
+    summarize_rows,
+)
+
+
+MODEL = "mock-model"
+
+
+def load_rows(pattern, limit=None):
+    rows = []
+    for path in sorted(glob.glob(pattern)):
+        df = pd.read_csv(path)
+        if limit:
+            df = df.head(limit)
+        for title, abstract in zip(df['文献标题'], df['摘要']):
+            rows.append((len(rows), title, abstract))
+    return rows
+
+
+def run_mode(client, rows, concurrency, batch, args):
+    metrics = Metrics()
+    start = time.monotonic()
+    failed = 0
+    results = summarize_rows(
+        make_summarizer(client, MODEL), rows,
+        concurrency=concurrency, rpm=None,
+        batch_summarize=make_batch_summarizer(client, MODEL) if batch else None,
+        context_tokens=get_model_limits(MODEL)["context"],
+        max_batch_size=args.batch_size,
+        metrics=metrics,
+    )
+    for _, _, error in results:
+        failed += error is not None
+    elapsed = time.monotonic() - start
+    summary = metrics.summary() or {}
+    return metrics, {
+        "rows": len(rows),
+        "failed": failed,
+        "seconds": round(elapsed, 2),
+        "rows_per_min": round(len(rows) / elapsed * 60, 1),
+        "requests": summary.get("requests", 0),
+        "retries": summary.get("retries", 0),
+        "latency_p50": summary.get("latency_p50"),
+        "latency_p95": summary.get("latency_p95"),
+        "ttft_p50": summary.get("ttft_p50"),
+        "tokens": summary.get("prompt_tokens", 0) + summary.get("completion_tokens", 0),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="离线基准测试")
+    parser.add_argument("--data", default="data/*.csv", help="回放的 CSV 文件")
+    parser.add_argument("--limit", type=int, default=40, help="每个文件最多回放的行数，0 为全部")
+    parser.add_argument("--modes", default="sequential,concurrent,batched")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--batch-size", type=int, default=MAX_BATCH_SIZE)
+    parser.add_argument("--ttft", type=float, default=0.1, help="模拟的首 token 延迟（秒）")
+    parser.add_argument("--decode", type=float, default=0.2, help="模拟的每篇生成耗时（秒）")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="返回 500 的概率")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="返回 429 的概率")
+    parser.add_argument("--csv", default=None, help="把每次请求的指标写入该 CSV 文件")
+    args = parser.parse_args()
+
+    server, base_url = start_server(
+        MockConfig(args.ttft, args.decode, args.error_rate, args.rate_limit_rate)
+    )
+    client = OpenAI(api_key="mock", base_url=base_url, max_retries=0)
+    rows = load_rows(args.data, args.limit or None)
+
+    modes = {
+        "sequential": (1, False),
+        "concurrent": (args.concurrency, False),
+        "batched": (args.concurrency, True),
+    }
+    report = {}
+    frames = []
+    for mode in args.modes.split(","):
+        concurrency, batch = modes[mode.strip()]
+        metrics, report[mode] = run_mode(client, rows, concurrency, batch, args)
+        frames.append(metrics.to_frame().assign(mode=mode))
+        print(f"{mode}: {report[mode]['rows_per_min']} 行/分钟")
+    server.shutdown()
+
+    print(pd.DataFrame(report).T.to_string())
+    if args.csv:
+        pd.concat(frames).to_csv(args.csv, index=False)
+
+
+if __name__ == "__main__":
+    main()
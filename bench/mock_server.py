@@ -0,0 +1,135 @@
+"""本地模拟的 OpenAI 兼容接口，用于离线基准测试
+
+支持 /v1/chat/completions 的流式与非流式请求，可配置首 token 延迟、
+每篇文章的生成耗时以及 429/5xx 错误注入。批量请求（用户消息为 JSON 数组）
+会按编号返回 JSON 数组。
+
+用法：
+    python -m bench.mock_server --port 8000 --ttft 0.2 --decode 1.0 --error-rate 0.05
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class MockConfig:
+    def __init__(self, ttft=0.1, decode=0.2, error_rate=0.0, rate_limit_rate=0.0, chunks=8):
+        self.ttft = ttft
+        self.decode = decode
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.chunks = chunks
+
+
+def make_reply(messages):
+    """按请求内容生成回复文本，批量请求返回 JSON 数组"""
+    content = messages[-1]["content"]
+    try:
+        papers = json.loads(content)
+    except (TypeError, json.JSONDecodeError):
+        papers = None
+    if isinstance(papers, list):
+        items = [{"id": paper.get("id"), "summary": f"这篇文章研究了{str(paper.get('title'))[:40]}。"}
+                 for paper in papers if isinstance(paper, dict)]
+        return json.dumps(items, ensure_ascii=False), max(1, len(items))
+    return f"这篇文章{str(content)[:60]}……", 1
+
+
+def make_handler(config):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def send_json(self, status, payload):
+            body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def send_event(self, payload):
+            data = f"data: {payload}\n\n".encode("utf-8")
+            self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+            self.wfile.flush()
+
+        def do_POST(self):
+            request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+
+            # 错误注入
+            roll = random.random()
+            if roll < config.rate_limit_rate:
+                return self.send_json(429, {"error": {"message": "rate limited", "type": "rate_limit"}})
+            if roll < config.rate_limit_rate + config.error_rate:
+                return self.send_json(500, {"error": {"message": "mock server error", "type": "server_error"}})
+
+            text, papers = make_reply(request["messages"])
+            prompt_tokens = sum(len(str(m["content"])) // 4 + 1 for m in request["messages"])
+            usage = {"prompt_tokens": prompt_tokens, "completion_tokens": len(text),
+                     "total_tokens": prompt_tokens + len(text)}
+            base = {"id": "chatcmpl-mock", "created": int(time.time()), "model": request["model"]}
+
+            time.sleep(config.ttft)
+            if not request.get("stream"):
+                time.sleep(config.decode * papers)
+                return self.send_json(200, {
+                    **base,
+                    "object": "chat.completion",
+                    "choices": [{"index": 0, "finish_reason": "stop",
+                                 "message": {"role": "assistant", "content": text}}],
+                    "usage": usage,
+                })
+
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            size = max(1, -(-len(text) // config.chunks))
+            for start in range(0, len(text), size):
+                self.send_event(json.dumps({
+                    **base,
+                    "object": "chat.completion.chunk",
+                    "choices": [{"index": 0, "finish_reason": None,
+                                 "delta": {"role": "assistant", "content": text[start:start + size]}}],
+                }, ensure_ascii=False))
+                time.sleep(config.decode * papers / config.chunks)
+            if (request.get("stream_options") or {}).get("include_usage"):
+                self.send_event(json.dumps({**base, "object": "chat.completion.chunk",
+                                            "choices": [], "usage": usage}))
+            self.send_event("[DONE]")
+            self.wfile.write(b"0\r\n\r\n")
+
+    return Handler
+
+
+def start_server(config, host="127.0.0.1", port=0):
+    """在后台线程启动模拟服务，返回 (server, base_url)"""
+    server = ThreadingHTTPServer((host, port), make_handler(config))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}/v1"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="模拟的 OpenAI 兼容接口")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--ttft", type=float, default=0.1, help="首 token 延迟（秒）")
+    parser.add_argument("--decode", type=float, default=0.2, help="每篇文章的生成耗时（秒）")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="返回 500 的概率")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="返回 429 的概率")
+    args = parser.parse_args()
+
+    config = MockConfig(args.ttft, args.decode, args.error_rate, args.rate_limit_rate)
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(config))
+    print(f"mock server listening on http://{args.host}:{args.port}/v1")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import unicodedata
+
+
+DEFAULT_CACHE_PATH = "./logdir/summary_cache.db"
+
+
+def normalize_text(text):
+    # NaN / None 视为空串；统一 Unicode 形式并折叠空白
+    if text is None or text != text:
+        return ""
+    return " ".join(unicodedata.normalize("NFKC", str(text)).split())
+
+
+def summary_key(model, system_prompt, temperature, title, abstract):
+    payload = json.dumps(
+        [model, system_prompt, temperature, normalize_text(title), normalize_text(abstract)],
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SummaryCache:
+    """基于 SQLite 的总结缓存，按内容哈希寻址，可在多次运行和多个用户间共享"""
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_entries=200_000, max_age_days=180):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_age = max_age_days * 24 * 3600
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            """CREATE TABLE IF NOT EXISTS summaries (
+                key TEXT PRIMARY KEY,
+                summary TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )"""
+        )
+        self.conn.commit()
+        self.evict()
+
+    def get(self, key):
+        return self.get_any([key])
+
+    def get_any(self, keys):
+        """依次查找多个候选键，返回第一个命中的总结；命中 / 未命中各只计一次"""
+        with self.lock:
+            for key in keys:
+                row = self.conn.execute(
+                    "SELECT summary FROM summaries WHERE key = ? AND created_at >= ?",
+                    (key, time.time() - self.max_age),
+                ).fetchone()
+                if row is not None:
+                    break
+            else:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.conn.execute(
+                "UPDATE summaries SET accessed_at = ? WHERE key = ?", (time.time(), key)
+            )
+            self.conn.commit()
+            return row[0]
+
+    def set(self, key, summary):
+        now = time.time()
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO summaries (key, summary, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, str(summary), now, now),
+            )
+            self.conn.commit()
+            self.writes += 1
+        if self.writes % 500 == 0:
+            self.evict()
+
+    def evict(self):
+        # 先删除过期条目，再按最近访问时间淘汰超出容量的部分
+        with self.lock:
+            self.conn.execute(
+                "DELETE FROM summaries WHERE created_at < ?", (time.time() - self.max_age,)
+            )
+            self.conn.execute(
+                """DELETE FROM summaries WHERE key IN (
+                    SELECT key FROM summaries ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                )""",
+                (self.max_entries,),
+            )
+            self.conn.commit()
+
+    def __len__(self):
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM summaries").fetchone()[0]
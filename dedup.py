@@ -0,0 +1,257 @@
+import re
+import sqlite3
+import threading
+import unicodedata
+import zlib
+from urllib.parse import parse_qs, unquote, urlparse
+
+import numpy as np
+
+
+DEFAULT_INDEX_PATH = "./logdir/paper_index.db"
+
+# MinHash 参数：64 个哈希函数，分成 16 个 band，每个 band 4 行
+NUM_PERM = 64
+BANDS = 16
+MINHASH_PRIME = (1 << 31) - 1
+NEAR_DUP_THRESHOLD = 0.8
+
+_rng = np.random.default_rng(20241028)
+_PERM_A = _rng.integers(1, MINHASH_PRIME, NUM_PERM, dtype=np.uint64)
+_PERM_B = _rng.integers(0, MINHASH_PRIME, NUM_PERM, dtype=np.uint64)
+
+
+def _query_param(link, name):
+    if not isinstance(link, str):
+        return None
+    values = parse_qs(urlparse(link).query).get(name)
+    return values[0] if values else None
+
+
+def extract_doi(link):
+    # Scopus 链接中的 DOI 形如 doi=10.1016%2fj.jretconser...
+    doi = _query_param(link, "doi")
+    if not doi:
+        return None
+    doi = unquote(doi).strip().lower()
+    return doi or None
+
+
+def extract_eid(link):
+    eid = _query_param(link, "eid")
+    return eid.strip().lower() if eid else None
+
+
+def normalize_title(title):
+    if not isinstance(title, str):
+        return ""
+    title = unicodedata.normalize("NFKC", title).lower()
+    return " ".join(re.findall(r"\w+", title))
+
+
+def minhash(text):
+    words = normalize_title(text).split()
+    shingles = {" ".join(words[i:i + 3]) for i in range(max(1, len(words) - 2))}
+    hashes = np.array([zlib.crc32(s.encode("utf-8")) for s in shingles], dtype=np.uint64)
+    hashes %= MINHASH_PRIME
+    return ((hashes[:, None] * _PERM_A + _PERM_B) % MINHASH_PRIME).min(axis=0)
+
+
+class _StoredSummaries(dict):
+    # 写入时同步保存到 PaperIndex 的 SQLite 文件
+    def __init__(self, index, model, items=()):
+        super().__init__(items)
+        self.index = index
+        self.model = model
+
+    def __setitem__(self, key, summary):
+        super().__setitem__(key, summary)
+        self.index._save_summary(self.model, key, summary)
+
+    def setdefault(self, key, summary=None):
+        if key not in self:
+            self[key] = summary
+        return self[key]
+
+    def update(self, *args, **kwargs):
+        for key, summary in dict(*args, **kwargs).items():
+            self[key] = summary
+
+
+class PaperIndex:
+    """跨文件的文献去重索引
+
+    依次按 DOI、Scopus EID、规范化标题以及 MinHash 近似重复识别同一篇文献，
+    为每行分配文献键；同一文献只需总结一次，结果分发到所有引用它的行。
+    键表、MinHash 签名与已完成的总结保存在 path 指向的 SQLite 中，重启后以及
+    reftool 与 app.py 之间都能复用；path 为 None 时只保存在内存中。
+    """
+
+    def __init__(self, path=DEFAULT_INDEX_PATH):
+        self.by_doi = {}
+        self.by_eid = {}
+        self.by_title = {}
+        self.signatures = {}
+        self.buckets = {}
+        self.sources = {}
+        self.summaries = {}
+        self.lock = threading.Lock()
+        self.conn = None
+        if path is not None:
+            self.conn = sqlite3.connect(path, check_same_thread=False)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS paper_ids (
+                    kind TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    PRIMARY KEY (kind, value)
+                );
+                CREATE TABLE IF NOT EXISTS signatures (
+                    key TEXT PRIMARY KEY,
+                    signature BLOB NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS paper_summaries (
+                    model TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    summary TEXT NOT NULL,
+                    PRIMARY KEY (model, key)
+                );
+                """
+            )
+            self.conn.commit()
+            self._load()
+
+    def _load(self):
+        tables = {"doi": self.by_doi, "eid": self.by_eid, "title": self.by_title}
+        for kind, value, key in self.conn.execute("SELECT kind, value, key FROM paper_ids"):
+            tables[kind][value] = key
+        for key, signature in self.conn.execute("SELECT key, signature FROM signatures"):
+            self._add_signature(key, np.frombuffer(signature, dtype=np.uint64))
+
+    def add(self, source, df):
+        """把一个导出文件加入索引，返回每行的文献键列表；同一 source 重复加入时直接返回已有结果"""
+        with self.lock:
+            if source not in self.sources:
+                self.sources[source] = [self._add_row(row) for _, row in df.iterrows()]
+                if self.conn is not None:
+                    self.conn.commit()
+            return self.sources[source]
+
+    def summaries_for(self, model):
+        """某个模型下已完成的 {文献键: 总结}；写入的新总结会被保存"""
+        with self.lock:
+            if model not in self.summaries:
+                rows = () if self.conn is None else self.conn.execute(
+                    "SELECT key, summary FROM paper_summaries WHERE model = ?", (model,)
+                ).fetchall()
+                self.summaries[model] = _StoredSummaries(self, model, rows)
+            return self.summaries[model]
+
+    def _save_summary(self, model, key, summary):
+        if self.conn is None or summary is None:
+            return
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO paper_summaries (model, key, summary) VALUES (?, ?, ?)",
+                (model, key, str(summary)),
+            )
+            self.conn.commit()
+
+    def _remember(self, kind, table, value, key):
+        if value in table:
+            return
+        table[value] = key
+        if self.conn is not None:
+            self.conn.execute(
+                "INSERT OR IGNORE INTO paper_ids (kind, value, key) VALUES (?, ?, ?)", (kind, value, key)
+            )
+
+    def _add_signature(self, key, signature):
+        self.signatures[key] = signature
+        for band in range(BANDS):
+            self.buckets.setdefault((band, signature[band::BANDS].tobytes()), []).append(key)
+
+    def _add_row(self, row):
+        link = row.get("链接")
+        doi, eid = extract_doi(link), extract_eid(link)
+        title = normalize_title(row.get("文献标题"))
+
+        key = None
+        if doi:
+            key = self.by_doi.get(doi)
+        if key is None and eid:
+            key = self.by_eid.get(eid)
+        if key is None and not doi:
+            key = self.by_title.get(title) if title else None
+            signature = minhash(f"{row.get('文献标题')} {row.get('摘要')}")
+            if key is None:
+                key = self._near_duplicate(signature)
+        else:
+            signature = None
+
+        if key is None:
+            key = f"doi:{doi}" if doi else f"eid:{eid}" if eid else f"title:{title}"
+        if doi:
+            self._remember("doi", self.by_doi, doi, key)
+        if eid:
+            self._remember("eid", self.by_eid, eid, key)
+        if title:
+            self._remember("title", self.by_title, title, key)
+        if key not in self.signatures:
+            if signature is None:
+                signature = minhash(f"{row.get('文献标题')} {row.get('摘要')}")
+            self._add_signature(key, signature)
+            if self.conn is not None:
+                self.conn.execute(
+                    "INSERT OR IGNORE INTO signatures (key, signature) VALUES (?, ?)",
+                    (key, signature.tobytes()),
+                )
+        return key
+
+    def _near_duplicate(self, signature):
+        candidates = set()
+        for band in range(BANDS):
+            candidates.update(self.buckets.get((band, signature[band::BANDS].tobytes()), []))
+        best, best_score = None, NEAR_DUP_THRESHOLD
+        for key in candidates:
+            score = float(np.mean(self.signatures[key] == signature))
+            if score >= best_score:
+                best, best_score = key, score
+        return best
+
+
+def summarize_unique(run, rows, keys, summaries, refresh=False):
+    """只总结每篇文献的一个代表行，再把结果分发给所有重复行
+
+    run 与 summarizer.summarize_rows 的用法相同；keys[index] 为该行的文献键，
+    summaries 为 {文献键: 总结}，已有总结的文献不再发起请求；refresh 为 True 时
+    忽略 summaries 中的已有总结，重新生成后覆盖。
+    """
+    groups = {}
+    for row in rows:
+        groups.setdefault(keys[row[0]], []).append(row)
+
+    unique = []
+    for key, members in groups.items():
+        if key in summaries and not refresh:
+            for index, _, _ in members:
+                yield index, summaries[key], None
+        else:
+            unique.append(members[0])
+
+    for index, summary, error in run(unique):
+        key = keys[index]
+        if error is None:
+            summaries[key] = summary
+        for member_index, _, _ in groups[key]:
+            yield member_index, summary, error
+
+
+def count_saved_calls(rows, keys, summaries, refresh=False):
+    """去重后可以省去的 LLM 调用次数；refresh 为 True 时已有总结不计入"""
+    unique = {keys[index] for index, _, _ in rows}
+    if refresh:
+        return len(rows) - len(unique)
+    return len(rows) - len(unique - summaries.keys())
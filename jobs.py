@@ -0,0 +1,147 @@
+import hashlib
+import io
+import json
+import os
+import threading
+
+import pandas as pd
+
+
+JOBS_DIR = "./logdir/jobs"
+
+_jobs = {}
+_jobs_lock = threading.Lock()
+
+
+def make_job_id(data, *parts):
+    """由上传文件内容与模型等参数生成任务 ID，同一文件重新上传会对应同一任务"""
+    digest = hashlib.sha256(data)
+    for part in parts:
+        digest.update(str(part).encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+def get_job(job_id, directory=JOBS_DIR):
+    # 任务对象在进程内共享，Streamlit 重跑脚本后可以重新挂接到正在运行的任务
+    with _jobs_lock:
+        if job_id not in _jobs:
+            _jobs[job_id] = Job(job_id, directory)
+        return _jobs[job_id]
+
+
+def _completed(results):
+    # 出错的行不算完成，续跑时会重新处理
+    return {index for index, record in results.items() if record["error"] is None}
+
+
+class Job:
+    """一次批量总结任务，每完成一行就追加写入 JSONL 检查点"""
+
+    def __init__(self, job_id, directory=JOBS_DIR):
+        os.makedirs(directory, exist_ok=True)
+        self.job_id = job_id
+        self.path = os.path.join(directory, f"{job_id}.jsonl")
+        self.results = {}
+        self.partial = {}
+        self.error = None
+        self.thread = None
+        self.lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        self.results = {}
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, encoding="utf-8") as f:
+            text = f.read()
+        for line in text.splitlines():
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # 中断时可能留下不完整的最后一行
+                continue
+            self.results[record["index"]] = record
+        if text and not text.endswith("\n"):
+            # 补上换行，避免后续追加的记录与残缺行粘在一起
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write("\n")
+
+    def record(self, index, title, summary, error=None):
+        record = {
+            "index": index,
+            "title": title,
+            "summary": None if summary is None else str(summary),
+            "error": None if error is None else str(error),
+        }
+        line = json.dumps(record, ensure_ascii=False)
+        with self.lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+            self.results[index] = record
+            self.partial.pop(index, None)
+
+    def stream(self, index, text):
+        # 记录正在生成中的总结文本，供页面逐字渲染
+        self.partial[index] = text
+
+    def snapshot(self):
+        """加锁复制当前结果，后台线程写入时页面可安全遍历"""
+        with self.lock:
+            return dict(self.results)
+
+    @property
+    def completed(self):
+        return _completed(self.snapshot())
+
+    @property
+    def running(self):
+        return self.thread is not None and self.thread.is_alive()
+
+    def start(self, rows, run):
+        """在后台线程中处理 rows 中尚未完成的行
+
+        rows 为 (index, title, abstract) 的序列；run(rows) 按完成顺序产出
+        (index, summary, error)，例如 summarizer.summarize_rows 的偏函数。
+        """
+        with self.lock:
+            if self.running:
+                return
+            completed = _completed(self.results)
+            remaining = [row for row in rows if row[0] not in completed]
+            titles = {row[0]: row[1] for row in remaining}
+            self.error = None
+
+            def work():
+                try:
+                    for index, summary, error in run(remaining):
+                        self.record(index, titles[index], summary, error)
+                except Exception as e:
+                    self.error = e
+
+            self.thread = threading.Thread(target=work, name=f"job-{self.job_id}", daemon=True)
+            self.thread.start()
+
+    def reset(self):
+        with self.lock:
+            if self.running:
+                return False
+            if os.path.exists(self.path):
+                os.remove(self.path)
+            self.results = {}
+            self.partial = {}
+            return True
+
+    def export(self, fmt):
+        """按需生成 json / csv / parquet 格式的结果文件内容"""
+        results = self.snapshot()
+        records = [results[index] for index in sorted(results)]
+        if fmt == "json":
+            return json.dumps(records, ensure_ascii=False, indent=2).encode("utf-8")
+        df = pd.DataFrame(records, columns=["index", "title", "summary", "error"])
+        if fmt == "csv":
+            return df.to_csv(index=False).encode("utf-8-sig")
+        if fmt == "parquet":
+            buffer = io.BytesIO()
+            df.to_parquet(buffer, index=False)
+            return buffer.getvalue()
+        raise ValueError(f"不支持的导出格式: {fmt}")
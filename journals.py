@@ -0,0 +1,395 @@
+from functools import lru_cache
+
+import pandas as pd
+
+
+# 期刊列表：UTD 24、FT 50 与 TJSEM 推荐期刊
+JOURNAL_LISTS = {
+    "utd": [
+        "The Accounting Review",
+        "Journal of Accounting and Economics",
+        "Journal of Accounting Research",
+        "Journal of Finance",
+        "Journal of Financial Economics",
+        "The Review of Financial Studies",
+        "Information Systems Research",
+        "Journal on Computing",
+        "MIS Quarterly",
+        "Journal of Consumer Research",
+        "Journal of Marketing",
+        "Journal of Marketing Research",
+        "Marketing Science",
+        "Management Science",
+        "Operations Research",
+        "Journal of Operations Management",
+        "Manufacturing and Service Operations Management",
+        "Production and Operations Management",
+        "Academy of Management Journal",
+        "Academy of Management Review",
+        "Administrative Science Quarterly",
+        "Organization Science",
+        "Journal of International Business Studies",
+        "Strategic Management Journal",
+    ],
+    "ft": [
+        "Academy of Management Journal",
+        "Academy of Management Review",
+        "Accounting, Organizations and Society",
+        "Administrative Science Quarterly",
+        "American Economic Review",
+        "Contemporary Accounting Research",
+        "Econometrica",
+        "Entrepreneurship Theory and Practice",
+        "Harvard Business Review",
+        "Human Relations",
+        "Human Resource Management",
+        "Information Systems Research",
+        "Journal of Accounting and Economics",
+        "Journal of Accounting Research",
+        "Journal of Applied Psychology",
+        "Journal of Business Ethics",
+        "Journal of Business Venturing",
+        "Journal of Consumer Psychology",
+        "Journal of Consumer Research",
+        "Journal of Finance",
+        "Journal of Financial and Quantitative Analysis",
+        "Journal of Financial Economics",
+        "Journal of International Business Studies",
+        "Journal of Management",
+        "Journal of Management Information Systems",
+        "Journal of Management Studies",
+        "Journal of Marketing",
+        "Journal of Marketing Research",
+        "Journal of Operations Management",
+        "Journal of Political Economy",
+        "Journal of the Academy of Marketing Science",
+        "Management Science",
+        "Manufacturing and Service Operations Management",
+        "Marketing Science",
+        "MIS Quarterly",
+        "Operations Research",
+        "Organization Science",
+        "Organization Studies",
+        "Organizational Behavior and Human Decision Processes",
+        "Production and Operations Management",
+        "Quarterly Journal of Economics",
+        "Research Policy",
+        "Review of Accounting Studies",
+        "Review of Economic Studies",
+        "Review of Finance",
+        "Review of Financial Studies",
+        "Sloan Management Review",
+        "Strategic Entrepreneurship Journal",
+        "Strategic Management Journal",
+        "The Accounting Review",
+        "Journal of Computing",
+    ],
+    "tjsem": [
+        "Academy of Management Journal",
+        "Academy of Management Review",
+        "Administrative Science Quarterly",
+        "American Economic Review",
+        "Econometrica",
+        "Information Systems Research",
+        "Journal of Accounting and Economics",
+        "Journal of Accounting Research",
+        "Journal of Consumer Research",
+        "Journal of Finance",
+        "Journal of Financial Economics",
+        "Journal of International Business Studies",
+        "Journal of Marketing",
+        "Journal of Marketing Research",
+        "Journal of Operations Management",
+        "Journal of Political Economy",
+        "Management Information Systems Quarterly",
+        "Management Science",
+        "Manufacturing & Service Operations Management",
+        "Marketing Science",
+        "Operations Research",
+        "Organization Science",
+        "Production and Operations Management",
+        "Quarterly Journal of Economics",
+        "Review of Economic Studies",
+        "Review of Financial Studies",
+        "Strategic Management Journal",
+        "The Accounting Review",
+        "Accounting, Organizations and Society",
+        "American Economic Journal: Applied Economics",
+        "American Economic Journal: Macroeconomics",
+        "American Economic Journal: Microeconomics",
+        "American Journal of Agricultural Economics",
+        "Contemporary Accounting Research",
+        "Entrepreneurship Theory and Practice",
+        "Global Environmental Change-Human and Policy Dimensions",
+        "Human Resource Management",
+        "IEEE Transactions on Automatic Control",
+        "International Economic Review",
+        "Journal of Applied Psychology",
+        "Journal of Business Venturing",
+        "Journal of Consumer Psychology",
+        "Journal of Development Economics",
+        "Journal of Economic Literature",
+        "Journal of Economic Theory",
+        "Journal of Financial and Quantitative Analysis",
+        "Journal of International Economics",
+        "Journal of Labor Economics",
+        "Journal of Management",
+        "Journal of Management Information Systems",
+        "Journal of Management Studies",
+        "Journal of Monetary Economics",
+        "Journal of Public Administration: Research and Theory",
+        "Journal of Public Economics",
+        "Journal of the Academy of Marketing Science",
+        "Journal of Urban Economics",
+        "Journal on Computing",
+        "Mathematical Programming",
+        "Organization Studies",
+        "Organizational Behaviour and Human Decision Processes",
+        "Personnel Psychology",
+        "Policy Studies Journal",
+        "Public Administration Review",
+        "Public Administration: An International Quarterly",
+        "Rand Journal of Economics",
+        "Regional Studies",
+        "Research Policy",
+        "Review of Accounting Studies",
+        "Review of Finance",
+        "Strategic Entrepreneurship Journal",
+        "The Journal of Law and Economics",
+        "The Review of Economics and Statistics",
+        "Transportation Research Part B: Methodological",
+        "Transportation Science",
+        "World Development",
+        "Abacus-A Journal of Accounting Finance and Business Studies",
+        "Academy of Management Perspectives",
+        "Accounting and Business Research",
+        "Accounting Horizons",
+        "American Economic Journal: Economic Policy",
+        "American Journal of Sociology",
+        "American Review of Public Administration",
+        "Annals of Statistics",
+        "Asia Pacific Journal of Management",
+        "Auditing: A Journal of Practice & Theory",
+        "Automation in Construction",
+        "British Journal of Management",
+        "Business Ethics Quarterly",
+        "California Management Review",
+        "Canadian Journal of Economics",
+        "Computers & Operations Research",
+        "Decision Sciences",
+        "Decision Support Systems",
+        "Ecological Economics",
+        "Econometric Theory",
+        "Economic Development and Cultural Change",
+        "Economic Inquiry",
+        "Economic Journal",
+        "Economica",
+        "Economics Letters",
+        "Energy Economics",
+        "Energy Journal",
+        "Environmental & Resource Economics",
+        "European Economic Review",
+        "European Journal of Information Systems",
+        "European Journal of Operational Research",
+        "Experimental Economics",
+        "Financial Management",
+        "Food Policy",
+        "Games and Economic Behavior",
+        "Governance–An International Journal of Policy Administration and Institutions",
+        "Harvard Business Review",
+        "Health Services Research",
+        "Human Relations",
+        "IEEE Transactions on Engineering Management",
+        "IISE Transactions",
+        "Industrial Marketing Management",
+        "Industrial Relations",
+        "Information and Management",
+        "International Journal of Human Resource Management",
+        "International Journal of Production Economics",
+        "International Journal of Project Management",
+        "International Journal of Research in Marketing",
+        "International Small Business Journal",
+        "Journal of Accounting and Public Policy",
+        "Journal of Accounting, Auditing and Finance",
+        "Journal of Advertising",
+        "Journal of Banking & Finance",
+        "Journal of Business & Economic Statistics",
+        "Journal of Business Ethics",
+        "Journal of Business Finance & Accounting",
+        "Journal of Comparative Economics",
+        "Journal of Construction Engineering and Management",
+        "Journal of Corporate Finance",
+        "Journal of Econometrics",
+        "Journal of Economic Behavior & Organization",
+        "Journal of Economic Dynamics & Control",
+        "Journal of Economic Geography",
+        "Journal of Economic Growth",
+        "Journal of Economic Perspectives",
+        "Journal of Empirical Finance",
+        "Journal of Environmental Economics and Management",
+        "Journal of European Public Policy",
+        "Journal of Financial Intermediation",
+        "Journal of Financial Markets",
+        "Journal of Futures Markets",
+        "Journal of Health Economics",
+        "Journal of Industrial Economics",
+        "Journal of Interactive Marketing",
+        "Journal of International Money and Finance",
+        "Journal of Money, Credit and Banking",
+        "Journal of Occupational and Organizational Psychology",
+        "Journal of Organizational Behavior",
+        "Journal of Policy Analysis and Management",
+        "Journal of Product Innovation Management",
+        "Journal of Real Estate Finance and Economics",
+        "Journal of Regional Science",
+        "Journal of Retailing",
+        "Journal of Risk and Uncertainty",
+        "Journal of Scheduling",
+        "Journal of Service Research",
+        "Journal of Social Policy",
+        "Journal of the American Statistical Association",
+        "Journal of the Association for Information Systems",
+        "Journal of the European Economic Association",
+        "Journal of Transportation Engineering, Part A: Systems",
+        "Journal of Vocational Behavior",
+        "Journal of World Business",
+        "Labour Economics",
+        "Land Economics",
+        "Leadership Quarterly",
+        "Management Accounting Research",
+        "Management and Organization Review",
+        "Marketing Letters",
+        "Mathematical Finance",
+        "Mathematics of Operations Research",
+        "MIT Sloan Management Review",
+        "Naval Research Logistics",
+        "Omega-International Journal of Management Science",
+        "Organizational Research Methods",
+        "Policy and Politics",
+        "Psychology & Marketing",
+        "Public Management Review",
+        "R & D Management",
+        "Real Estate Economics",
+        "Regional Science & Urban Economics",
+        "Regulation and Governance",
+        "Review of Economic Dynamics",
+        "Risk Analysis",
+        "Scandinavian Journal of Economics",
+        "Technological Forecasting and Social Change",
+        "Technovation",
+        "Transportation Research Part A: Policy and Practice",
+        "Transportation Research Part E: Logistics and Transportation Review",
+        "Accounting and Finance",
+        "ACM Transactions on Information Systems",
+        "Agricultural Economics",
+        "Annals of Operations Research",
+        "Applied Economics",
+        "Asia Pacific Journal of Human Resources",
+        "B E Journal of Macroeconomics",
+        "British Journal of Industrial Relations",
+        "Business & Society",
+        "China Economic Review",
+        "Econometric Reviews",
+        "Economic Modelling",
+        "Economics of Education Review",
+        "Entrepreneurship & Regional Development",
+        "European Accounting Review",
+        "European Journal of Work and Organizational Psychology",
+        "Family Business Review",
+        "Financial Analysts Journal",
+        "Health Economics",
+        "Human Resource Management Journal",
+        "ILR Review",
+        "Information Systems Journal",
+        "Insurance: Mathematics and Economics",
+        "International Business Review",
+        "International Journal of Advertising",
+        "International Journal of Electronic Commerce",
+        "International Journal of Forecasting",
+        "International Journal of Market Research",
+        "International Journal of Production Research",
+        "Journal of Agricultural Economics",
+        "Journal of Business Research",
+        "Journal of Derivatives",
+        "Journal of Economic Psychology",
+        "Journal of Economics & Management Strategy",
+        "Journal of Financial Research",
+        "Journal of Management Accounting Research",
+        "Journal of Management in Engineering",
+        "Journal of Managerial Psychology",
+        "Journal of Optimization Theory and Applications",
+        "Journal of Regulatory Economics",
+        "Journal of Risk and Insurance",
+        "Journal of Small Business Management",
+        "Journal of Strategic Information Systems",
+        "Journal of Supply Chain Management",
+        "Journal of the American Taxation Association",
+        "Journal of the Operational Research Society",
+        "Oxford Economic Papers",
+        "Oxford Review of Economic Policy",
+        "Public Choice",
+        "Quantitative Economics",
+        "Quantitative Finance",
+        "Resource and Energy Economics",
+        "Review of Environmental Economics and Policy",
+        "Review of Quantitative Finance and Accounting",
+        "Service Industries Journal",
+        "Supply Chain Management - An International Journal",
+        "The International Journal of Accounting",
+    ],
+}
+
+# 检索式中字段前缀
+QUERY_PREFIX = {
+    "wos": "SO=",
+    "scopus": "SRCTITLE ",
+}
+
+# 常见的期刊名变体（均为规范化后的形式），映射到列表中的规范名称
+JOURNAL_ALIASES = {
+    "mis quarterly": "management information systems quarterly",
+    "mis quarterly management information systems": "management information systems quarterly",
+    "informs journal on computing": "journal on computing",
+    "iie transactions": "iise transactions",
+    "industrial and labor relations review": "ilr review",
+    "omega": "omega international journal of management science",
+    "abacus": "abacus a journal of accounting finance and business studies",
+    "global environmental change": "global environmental change human and policy dimensions",
+    "governance": "governance an international journal of policy administration and institutions",
+    "supply chain management": "supply chain management an international journal",
+}
+
+
+def normalize_journals(names):
+    """向量化规范化期刊名：统一大小写、“&”与“and”、英式拼写、标点和括号注释"""
+    names = pd.Series(names, dtype="string")
+    names = (
+        names.str.normalize("NFKC")
+        .str.lower()
+        .str.replace(r"\(.*?\)", " ", regex=True)
+        .str.replace("&", " and ", regex=False)
+        .str.replace(r"\bbehaviour\b", "behavior", regex=True)
+        .str.replace(r"[^\w]+", " ", regex=True)
+        .str.strip()
+        .str.replace(r"^the ", "", regex=True)
+    )
+    return names.replace(JOURNAL_ALIASES)
+
+
+# 模块加载时预先计算每个列表的规范化索引
+JOURNAL_INDEX = {
+    category: frozenset(normalize_journals(names).dropna())
+    for category, names in JOURNAL_LISTS.items()
+}
+
+
+@lru_cache(maxsize=None)
+def build_query(category, source):
+    names = " OR ".join(f'"{name}"' for name in JOURNAL_LISTS[category])
+    return f"{QUERY_PREFIX[source]}({names})"
+
+
+def journal_mask(sources, category):
+    """返回 sources 中属于指定期刊列表的布尔掩码"""
+    normalized = normalize_journals(sources)
+    return normalized.isin(JOURNAL_INDEX[category]).fillna(False).astype(bool).to_numpy()
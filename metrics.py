@@ -0,0 +1,71 @@
+import threading
+from collections import deque
+
+import pandas as pd
+
+
+def busy_seconds(df):
+    """请求区间 [submitted_at, finished_at] 并集的总时长，不计任务之间的空闲时间"""
+    total, start, end = 0.0, None, None
+    for submitted, finished in sorted(zip(df["submitted_at"], df["finished_at"])):
+        if end is None or submitted > end:
+            if end is not None:
+                total += end - start
+            start, end = submitted, finished
+        else:
+            end = max(end, finished)
+    if end is not None:
+        total += end - start
+    return total
+
+
+class Metrics:
+    """记录每次 LLM 请求的排队时间、首 token 延迟、总耗时、token 数与重试次数"""
+
+    FIELDS = [
+        "kind", "rows", "ok", "attempts", "queue_wait", "ttft", "latency",
+        "prompt_tokens", "completion_tokens", "submitted_at", "finished_at",
+    ]
+
+    def __init__(self, maxlen=20_000):
+        self.records = deque(maxlen=maxlen)
+        self.lock = threading.Lock()
+
+    def record(self, stats):
+        with self.lock:
+            self.records.append({field: stats.get(field) for field in self.FIELDS})
+
+    def clear(self):
+        with self.lock:
+            self.records.clear()
+
+    def to_frame(self):
+        with self.lock:
+            records = list(self.records)
+        return pd.DataFrame(records, columns=self.FIELDS)
+
+    def to_csv(self):
+        return self.to_frame().to_csv(index=False)
+
+    def summary(self):
+        """汇总 p50/p95 延迟与吞吐量；没有记录时返回 None"""
+        df = self.to_frame()
+        if df.empty:
+            return None
+        ok = df[df["ok"].astype(bool)]
+        span = busy_seconds(df)
+        rows = int(ok["rows"].sum())
+        result = {
+            "requests": len(df),
+            "errors": int(len(df) - len(ok)),
+            "retries": int((df["attempts"] - 1).clip(lower=0).sum()),
+            "rows": rows,
+            "rows_per_min": rows / span * 60 if span > 0 else 0.0,
+            "prompt_tokens": int(pd.to_numeric(ok["prompt_tokens"]).fillna(0).sum()),
+            "completion_tokens": int(pd.to_numeric(ok["completion_tokens"]).fillna(0).sum()),
+        }
+        for field in ("queue_wait", "ttft", "latency"):
+            values = pd.to_numeric(ok[field], errors="coerce").dropna()
+            result[f"{field}_p50"] = values.quantile(0.5) if len(values) else None
+            result[f"{field}_p95"] = values.quantile(0.95) if len(values) else None
+        return result
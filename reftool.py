@@ -0,0 +1,266 @@
+"""命令行批量总结 Scopus 导出的 CSV 文件
+
+用法示例：
+    python reftool.py "data/*.csv" --formats txt,jsonl,parquet
+"""
+import argparse
+import glob
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import partial
+
+import pandas as pd
+
+from cache import SummaryCache, summary_key
+from dedup import PaperIndex, normalize_title, summarize_unique
+from metrics import Metrics
+from search import SearchIndex, load_summaries, papers_from_csv
+from summarizer import (
+    BATCH_PROMPT,
+    MAX_BATCH_SIZE,
+    MODEL_LIMITS,
+    SUMMARY_PROMPT,
+    get_model_limits,
+    make_batch_summarizer,
+    make_summarizer,
+    summarize_rows,
+)
+
+
+def make_client():
+    from dotenv import find_dotenv, load_dotenv
+    from openai import OpenAI
+
+    load_dotenv(find_dotenv())
+    return OpenAI(
+        api_key=os.getenv('OPENAI_API_KEY'),
+        base_url=os.getenv('OPENAI_BASE_URL'),
+        max_retries=0,  # 重试统一由 summarizer 负责
+    )
+
+
+class ResultWriter:
+    """按原始行顺序把结果增量写入 output 目录下的 txt / jsonl / parquet 文件"""
+
+    def __init__(self, output_dir, name, formats, row_group_size=50):
+        os.makedirs(output_dir, exist_ok=True)
+        base = os.path.join(output_dir, name)
+        self.files = {}
+        for fmt in ("txt", "jsonl"):
+            if fmt in formats:
+                self.files[fmt] = open(f"{base}.{fmt}", "w", encoding="utf-8")
+        self.parquet_path = f"{base}.parquet" if "parquet" in formats else None
+        self.parquet_writer = None
+        self.row_group = []
+        self.row_group_size = row_group_size
+        self.buffer = {}
+        self.next_index = 0
+
+    def add(self, index, record):
+        # 结果按完成顺序到达，先缓冲，再写出连续的前缀
+        self.buffer[index] = record
+        while self.next_index in self.buffer:
+            self.write(self.buffer.pop(self.next_index))
+            self.next_index += 1
+
+    def write(self, record):
+        if "txt" in self.files and record["summary"] is not None:
+            # txt 以空行分隔各篇，总结内部的空行需折叠，否则无法按篇读回；完整文本以 jsonl 为准
+            summary = re.sub(r"\n\s*\n", "\n", record["summary"].strip())
+            self.files["txt"].write(f"{record['title']}\n{summary}\n\n")
+            self.files["txt"].flush()
+        if "jsonl" in self.files:
+            self.files["jsonl"].write(json.dumps(record, ensure_ascii=False) + "\n")
+            self.files["jsonl"].flush()
+        if self.parquet_path:
+            self.row_group.append(record)
+            if len(self.row_group) >= self.row_group_size:
+                self.flush_parquet()
+
+    def flush_parquet(self):
+        if not self.row_group:
+            return
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        table = pa.Table.from_pylist(self.row_group, schema=pa.schema([
+            ("index", pa.int64()),
+            ("title", pa.string()),
+            ("link", pa.string()),
+            ("summary", pa.string()),
+            ("error", pa.string()),
+        ]))
+        if self.parquet_writer is None:
+            self.parquet_writer = pq.ParquetWriter(self.parquet_path, table.schema)
+        self.parquet_writer.write_table(table)
+        self.row_group = []
+
+    def close(self):
+        self.flush_parquet()
+        if self.parquet_writer is not None:
+            self.parquet_writer.close()
+        for f in self.files.values():
+            f.close()
+
+
+def process_file(path, args, keys, representatives, summaries):
+    """在子进程中总结单个 CSV 文件，返回 (文件名, 成功行数, 失败行数, 耗时, {文献键: 总结})
+
+    keys 为每行的文献键，representatives 为 {文献键: (标题, 摘要)}，summaries 为此前
+    运行中已完成的 {文献键: 总结}。重复文献使用同一份代表文本，因而在文件内只请求一次，
+    跨文件则通过共享缓存复用。
+    """
+    start = time.time()
+    name = os.path.splitext(os.path.basename(path))[0]
+    client = make_client()
+    df = pd.read_csv(path)
+    titles = df['文献标题'].tolist()
+    links = df['链接'].tolist() if '链接' in df.columns else [None] * len(df)
+    rows = [(i, *representatives[key]) for i, key in enumerate(keys)]
+
+    cache = None if args.no_cache else SummaryCache(args.cache_path)
+    metrics = Metrics() if args.metrics else None
+    run = partial(
+        summarize_rows,
+        make_summarizer(client, args.model, temperature=args.temperature),
+        concurrency=args.concurrency, rpm=args.rpm,
+        cache=cache,
+        key_of=partial(summary_key, args.model, SUMMARY_PROMPT, args.temperature),
+        batch_key_of=partial(summary_key, args.model, BATCH_PROMPT, args.temperature),
+        refresh=args.refresh,
+        batch_summarize=make_batch_summarizer(client, args.model, temperature=args.temperature) if args.batch else None,
+        context_tokens=get_model_limits(args.model)["context"],
+        max_batch_size=args.batch_size,
+        metrics=metrics,
+    )
+    results = summarize_unique(run, rows, keys=keys, summaries=summaries)
+
+    writer = ResultWriter(args.output_dir, name, args.formats)
+    failed = 0
+    try:
+        for index, summary, error in results:
+            failed += error is not None
+            writer.add(index, {
+                "index": index,
+                "title": titles[index],
+                "link": links[index],
+                "summary": None if summary is None else str(summary),
+                "error": None if error is None else str(error),
+            })
+    finally:
+        writer.close()
+        if metrics is not None:
+            metrics.to_frame().to_csv(os.path.join(args.output_dir, f"{name}_metrics.csv"), index=False)
+    return name, len(rows) - failed, failed, time.time() - start, summaries
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="reftool", description="批量总结 Scopus 导出的 CSV 文件")
+    parser.add_argument("patterns", nargs="+", help="CSV 文件或通配符，例如 'data/*.csv'")
+    parser.add_argument("--model", default=next(iter(MODEL_LIMITS)), help="模型名称")
+    parser.add_argument("--temperature", type=float, default=0.5)
+    parser.add_argument("--output-dir", default="./output", help="输出目录")
+    parser.add_argument("--formats", default="txt,jsonl",
+                        help="输出格式，逗号分隔，可选 txt,jsonl,parquet")
+    parser.add_argument("--processes", type=int, default=None, help="并行处理的文件数")
+    parser.add_argument("--concurrency", type=int, default=None, help="每个文件的并发请求数")
+    parser.add_argument("--rpm", type=int, default=None, help="所有进程合计的每分钟请求上限")
+    parser.add_argument("--batch", action="store_true", help="多篇文章合并为一次请求")
+    parser.add_argument("--batch-size", type=int, default=MAX_BATCH_SIZE, help="每批最多篇数")
+    parser.add_argument("--refresh", action="store_true", help="忽略已有缓存")
+    parser.add_argument("--no-cache", action="store_true", help="不读写总结缓存")
+    parser.add_argument("--cache-path", default="./logdir/summary_cache.db")
+    parser.add_argument("--no-index", action="store_true", help="不把结果写入检索索引")
+    parser.add_argument("--metrics", action="store_true", help="把每次请求的耗时与 token 数写入 <文件名>_metrics.csv")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    paths = sorted({path for pattern in args.patterns for path in glob.glob(pattern)})
+    if not paths:
+        raise SystemExit("没有匹配的 CSV 文件")
+
+    limits = get_model_limits(args.model)
+    args.formats = {fmt.strip() for fmt in args.formats.split(",") if fmt.strip()}
+    args.processes = args.processes or min(len(paths), os.cpu_count() or 1)
+    args.concurrency = args.concurrency or limits["concurrency"]
+    # RPM 上限在各进程间平均分配
+    args.rpm = max(1, (args.rpm or limits["rpm"]) // args.processes)
+
+    # 去重：在所有文件之间按 DOI / EID / 标题 / MinHash 识别同一文献
+    index = PaperIndex()
+    plan = {}
+    representatives = {}
+    for path in paths:
+        # 无法读取或缺少必要列的文件单独跳过，不影响其他文件
+        try:
+            df = pd.read_csv(path)
+        except Exception as e:
+            print(f"[{path}] 读取失败，已跳过: {e}")
+            continue
+        if '文献标题' not in df.columns or '摘要' not in df.columns:
+            print(f"[{path}] 缺少 '文献标题' 或 '摘要' 列，已跳过")
+            continue
+        keys = index.add(path, df)
+        for key, title, abstract in zip(keys, df['文献标题'], df['摘要']):
+            representatives.setdefault(key, (title, abstract))
+        plan[path] = keys
+    if not plan:
+        raise SystemExit("没有可处理的 CSV 文件")
+
+    # 文件内的重复一定只请求一次；跨文件的重复只能通过共享缓存复用，
+    # 并行处理时同一文献可能在多个进程中同时请求，因此只能给出区间
+    total_rows = sum(len(keys) for keys in plan.values())
+    within_file = sum(len(keys) - len(set(keys)) for keys in plan.values())
+    across_files = total_rows - len(representatives)
+    if args.no_cache or args.refresh or within_file == across_files:
+        saved = f"节省 {within_file} 次 LLM 调用"
+    elif args.processes == 1:
+        saved = f"节省 {across_files} 次 LLM 调用"
+    else:
+        saved = f"节省 {within_file}～{across_files} 次 LLM 调用（跨文件重复需等先完成的文件写入缓存后才能复用）"
+    print(f"去重：{total_rows} 行对应 {len(representatives)} 篇不同文献，{saved}")
+
+    # 此前运行（包括 app.py）已总结过的文献直接复用
+    known = {} if args.refresh else index.summaries_for(args.model)
+    reused = sum(key in known for key in representatives)
+    if reused:
+        print(f"已有总结：{reused} 篇文献直接复用")
+
+    search_index = None if args.no_index else SearchIndex()
+
+    with ProcessPoolExecutor(max_workers=args.processes) as executor:
+        futures = {
+            executor.submit(process_file, path, args, keys,
+                            {key: representatives[key] for key in set(keys)},
+                            {key: known[key] for key in set(keys) if key in known}): path
+            for path, keys in plan.items()
+        }
+        for future in as_completed(futures):
+            try:
+                name, succeeded, failed, elapsed, summaries = future.result()
+            except Exception as e:
+                print(f"[{futures[future]}] 处理失败: {e}")
+                continue
+            print(f"[{name}] 完成 {succeeded} 行，失败 {failed} 行，用时 {elapsed:.1f}s")
+            index.summaries_for(args.model).update(summaries)
+
+            # 新结果增量写入检索索引
+            if search_index is not None:
+                papers = papers_from_csv(futures[future])
+                search_index.add_papers(papers)
+                # 优先读取 jsonl；txt 按该文件的标题切分，避免多段总结被拆开
+                titles = {normalize_title(paper["title"]) for paper in papers}
+                for fmt in ("jsonl", "txt"):
+                    output = os.path.join(args.output_dir, f"{name}.{fmt}")
+                    if fmt in args.formats and os.path.exists(output):
+                        search_index.add_summaries(load_summaries(output, titles))
+                        break
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,365 @@
+import glob
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+
+import pandas as pd
+
+from dedup import extract_doi, extract_eid, normalize_title
+
+
+DEFAULT_INDEX_PATH = "./logdir/search_index.db"
+
+# 索引结构或切分方式变化时递增，旧索引会被清空并在下次更新时重建
+SCHEMA_VERSION = 2
+
+# BM25 列权重：标题、摘要、总结
+COLUMN_WEIGHTS = (3.0, 1.0, 1.5)
+
+ENGLISH_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the this to was were "
+    "which with we our their these those than into can not but also been how what when why".split()
+)
+
+_WORD = re.compile(r"[a-z0-9]+")
+_CJK_RUN = re.compile(r"[\u3400-\u4dbf\u4e00-\u9fff]+")
+
+
+def tokenize_english(text):
+    if not isinstance(text, str):
+        return []
+    text = unicodedata.normalize("NFKC", text).lower()
+    return [word for word in _WORD.findall(text) if word not in ENGLISH_STOPWORDS]
+
+
+def tokenize_chinese(text, unigrams=False):
+    """中文按字二元组切分（单字词保留单字），夹杂的英文术语按英文规则切分
+
+    unigrams 为 True 时额外输出每个单字，用于建索引，使单字检索词也能命中。
+    """
+    if not isinstance(text, str):
+        return []
+    text = unicodedata.normalize("NFKC", text)
+    tokens = []
+    for run in _CJK_RUN.findall(text):
+        if len(run) == 1:
+            tokens.append(run)
+        else:
+            tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+            if unigrams:
+                tokens.extend(run)
+    return tokens + tokenize_english(text)
+
+
+def tokenize_query(query):
+    tokens = tokenize_chinese(query)
+    # 去重并保持顺序
+    return list(dict.fromkeys(tokens))
+
+
+def paper_key(link, title):
+    doi = extract_doi(link)
+    if doi:
+        return f"doi:{doi}"
+    eid = extract_eid(link)
+    if eid:
+        return f"eid:{eid}"
+    return f"title:{normalize_title(title)}"
+
+
+def _clean(value):
+    # NaN 统一为 None，便于写入 SQLite
+    if value is None or value != value:
+        return None
+    return value
+
+
+class SearchIndex:
+    """基于 SQLite FTS5 的全文检索索引，BM25 排序，可增量更新
+
+    标题和摘要按英文切分，总结按中文单字与二元组切分；同一文献（DOI / EID / 标题）只保留一条，
+    再次加入时合并字段而不是重建索引。总结按规范化标题另存一份，先到的总结与后到的
+    CSV（或反之）都能关联上。
+    """
+
+    def __init__(self, path=DEFAULT_INDEX_PATH):
+        self.path = path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            self.conn.executescript(
+                """
+                DROP TABLE IF EXISTS papers;
+                DROP TABLE IF EXISTS papers_fts;
+                DROP TABLE IF EXISTS summaries;
+                DROP TABLE IF EXISTS indexed_files;
+                """
+            )
+            self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self.conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS papers (
+                id INTEGER PRIMARY KEY,
+                key TEXT UNIQUE NOT NULL,
+                norm_title TEXT,
+                title TEXT,
+                abstract TEXT,
+                summary TEXT,
+                year INTEGER,
+                source TEXT,
+                link TEXT,
+                file TEXT
+            );
+            CREATE INDEX IF NOT EXISTS papers_norm_title ON papers (norm_title);
+            CREATE INDEX IF NOT EXISTS papers_year ON papers (year);
+            CREATE INDEX IF NOT EXISTS papers_source ON papers (source);
+            CREATE VIRTUAL TABLE IF NOT EXISTS papers_fts USING fts5(title, abstract, summary);
+            CREATE TABLE IF NOT EXISTS summaries (
+                norm_title TEXT PRIMARY KEY,
+                summary TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS indexed_files (
+                path TEXT PRIMARY KEY,
+                mtime REAL NOT NULL
+            );
+            """
+        )
+        self.conn.commit()
+
+    def add_papers(self, papers):
+        """加入或更新文献；papers 为包含 title / abstract / summary / year / source / link / file 的字典"""
+        with self.lock:
+            for paper in papers:
+                self._upsert(paper)
+            self.conn.commit()
+
+    def add_summaries(self, summaries):
+        """加入 {规范化标题: 总结}，并更新索引中同标题的文献，返回更新的文献数
+
+        已有更长的总结时保留原文，避免 txt 等格式中截断的总结覆盖完整文本。
+        """
+        updated = 0
+        with self.lock:
+            for norm_title, summary in summaries.items():
+                if not norm_title or not summary:
+                    continue
+                self.conn.execute(
+                    "INSERT INTO summaries (norm_title, summary) VALUES (?, ?) "
+                    "ON CONFLICT (norm_title) DO UPDATE SET summary = excluded.summary "
+                    "WHERE length(excluded.summary) > length(summaries.summary)",
+                    (norm_title, summary),
+                )
+                rows = self.conn.execute(
+                    "SELECT id, title, abstract FROM papers "
+                    "WHERE norm_title = ? AND (summary IS NULL OR length(summary) < length(?))",
+                    (norm_title, summary),
+                ).fetchall()
+                for doc_id, title, abstract in rows:
+                    self.conn.execute("UPDATE papers SET summary = ? WHERE id = ?", (summary, doc_id))
+                    self.conn.execute("DELETE FROM papers_fts WHERE rowid = ?", (doc_id,))
+                    self._index(doc_id, title, abstract, summary)
+                    updated += 1
+            self.conn.commit()
+        return updated
+
+    def _upsert(self, paper):
+        fields = ("title", "abstract", "summary", "year", "source", "link", "file")
+        paper = {field: _clean(paper.get(field)) for field in fields}
+        if paper["year"] is not None:
+            paper["year"] = int(paper["year"])
+        key = paper_key(paper["link"], paper["title"])
+        norm_title = normalize_title(paper["title"])
+        if paper["summary"] is None and norm_title:
+            # 总结文件可能先于 CSV 加入索引
+            row = self.conn.execute(
+                "SELECT summary FROM summaries WHERE norm_title = ?", (norm_title,)
+            ).fetchone()
+            if row is not None:
+                paper["summary"] = row[0]
+
+        row = self.conn.execute(
+            f"SELECT id, {', '.join(fields)} FROM papers WHERE key = ?", (key,)
+        ).fetchone()
+        if row is not None:
+            # 已有文献：新值为空的字段沿用旧值
+            doc_id = row[0]
+            old = dict(zip(fields, row[1:]))
+            paper = {field: paper[field] if paper[field] is not None else old[field] for field in fields}
+            if paper == old:
+                return
+            self.conn.execute("DELETE FROM papers_fts WHERE rowid = ?", (doc_id,))
+            self.conn.execute(
+                f"UPDATE papers SET norm_title = ?, {', '.join(f'{field} = ?' for field in fields)} WHERE id = ?",
+                (normalize_title(paper["title"]), *[paper[field] for field in fields], doc_id),
+            )
+        else:
+            doc_id = self.conn.execute(
+                f"INSERT INTO papers (key, norm_title, {', '.join(fields)}) "
+                f"VALUES (?, ?, {', '.join('?' for _ in fields)})",
+                (key, norm_title, *[paper[field] for field in fields]),
+            ).lastrowid
+
+        self._index(doc_id, paper["title"], paper["abstract"], paper["summary"])
+
+    def _index(self, doc_id, title, abstract, summary):
+        self.conn.execute(
+            "INSERT INTO papers_fts (rowid, title, abstract, summary) VALUES (?, ?, ?, ?)",
+            (
+                doc_id,
+                " ".join(tokenize_english(title)),
+                " ".join(tokenize_english(abstract)),
+                " ".join(tokenize_chinese(summary, unigrams=True)),
+            ),
+        )
+
+    def search(self, query, limit=20, year_range=None, sources=None):
+        """返回按 BM25 排序的检索结果 DataFrame，可按年份区间与来源出版物筛选
+
+        未传入 year_range 时不按年份筛选，缺少年份的文献也会返回。
+        """
+        tokens = tokenize_query(query)
+        columns = ["title", "abstract", "summary", "year", "source", "link", "file", "score"]
+        if not tokens:
+            return pd.DataFrame(columns=columns)
+
+        sql = (
+            f"SELECT p.title, p.abstract, p.summary, p.year, p.source, p.link, p.file, "
+            f"bm25(papers_fts, {', '.join(map(str, COLUMN_WEIGHTS))}) AS score "
+            "FROM papers_fts JOIN papers p ON p.id = papers_fts.rowid "
+            "WHERE papers_fts MATCH ?"
+        )
+        params = [" OR ".join(f'"{token}"' for token in tokens)]
+        if year_range is not None:
+            sql += " AND p.year BETWEEN ? AND ?"
+            params.extend(year_range)
+        if sources:
+            sql += f" AND p.source IN ({', '.join('?' for _ in sources)})"
+            params.extend(sources)
+        sql += " ORDER BY score LIMIT ?"
+        params.append(limit)
+
+        with self.lock:
+            rows = self.conn.execute(sql, params).fetchall()
+        return pd.DataFrame(rows, columns=columns)
+
+    def stats(self):
+        with self.lock:
+            count, year_min, year_max = self.conn.execute(
+                "SELECT COUNT(*), MIN(year), MAX(year) FROM papers"
+            ).fetchone()
+            sources = [row[0] for row in self.conn.execute(
+                "SELECT source FROM papers WHERE source IS NOT NULL "
+                "GROUP BY source ORDER BY COUNT(*) DESC"
+            )]
+        return {"papers": count, "year_min": year_min, "year_max": year_max, "sources": sources}
+
+    def titles(self):
+        """索引中所有文献的规范化标题"""
+        with self.lock:
+            return {row[0] for row in self.conn.execute(
+                "SELECT DISTINCT norm_title FROM papers WHERE norm_title != ''"
+            )}
+
+    def is_indexed(self, path):
+        with self.lock:
+            row = self.conn.execute("SELECT mtime FROM indexed_files WHERE path = ?", (path,)).fetchone()
+        return row is not None and row[0] >= os.path.getmtime(path)
+
+    def mark_indexed(self, path):
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO indexed_files (path, mtime) VALUES (?, ?)",
+                (path, os.path.getmtime(path)),
+            )
+            self.conn.commit()
+
+
+def papers_from_csv(path, summaries=None):
+    """读取 Scopus 导出的 CSV，summaries 为 {规范化标题: 总结}"""
+    df = pd.read_csv(path)
+    summaries = summaries or {}
+    name = os.path.splitext(os.path.basename(path))[0]
+    return [
+        {
+            "title": row.get("文献标题"),
+            "abstract": row.get("摘要"),
+            "summary": summaries.get(normalize_title(row.get("文献标题"))),
+            "year": row.get("年份"),
+            "source": row.get("来源出版物名称"),
+            "link": row.get("链接"),
+            "file": name,
+        }
+        for _, row in df.iterrows()
+    ]
+
+
+def load_summaries(path, titles=None):
+    """从 output/*.txt、output/*.jsonl 或任务检查点读取 {规范化标题: 总结}
+
+    txt 为标题一行、其后为总结，各篇之间空一行；总结本身可能含空行，因此传入 titles
+    （已知的规范化标题集合）时按标题行切分，未传入时才按空行切分。
+    """
+    summaries = {}
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+    if path.endswith(".jsonl"):
+        for line in text.splitlines():
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if record.get("summary"):
+                summaries[normalize_title(record.get("title"))] = record["summary"]
+    elif titles is not None:
+        current, lines = None, []
+        for line in text.splitlines() + [None]:
+            norm_title = normalize_title(line)
+            if line is None or norm_title in titles:
+                summary = "\n".join(lines).strip()
+                if current is not None and summary:
+                    summaries[current] = summary
+                current, lines = norm_title, []
+            elif current is not None:
+                lines.append(line.strip())
+    else:
+        for block in text.split("\n\n"):
+            lines = block.strip().split("\n", 1)
+            if len(lines) == 2:
+                summaries[normalize_title(lines[0])] = lines[1].strip()
+    return summaries
+
+
+def update_index(index, csv_pattern="./data/*.csv",
+                 summary_patterns=("./output/*.txt", "./output/*.jsonl", "./logdir/jobs/*.jsonl")):
+    """增量更新索引：只读取新增或修改过的文件，返回 (处理的文件数, 耗时)
+
+    总结文件只更新同标题的文献，新 CSV 从索引中已有的总结关联，均无需重建。
+    先处理 CSV，txt 总结按索引中已知的标题切分；同名 jsonl 存在时跳过 txt。
+    """
+    start = time.time()
+    changed = 0
+    for path in sorted(glob.glob(csv_pattern)):
+        if index.is_indexed(path):
+            continue
+        index.add_papers(papers_from_csv(path))
+        index.mark_indexed(path)
+        changed += 1
+
+    titles = None
+    summary_paths = sorted(path for pattern in summary_patterns for path in glob.glob(pattern))
+    for path in summary_paths:
+        if index.is_indexed(path):
+            continue
+        if path.endswith(".txt") and os.path.exists(f"{os.path.splitext(path)[0]}.jsonl"):
+            continue
+        if path.endswith(".txt") and titles is None:
+            titles = index.titles()
+        index.add_summaries(load_summaries(path, titles))
+        index.mark_indexed(path)
+        changed += 1
+    return changed, time.time() - start
@@ -0,0 +1,295 @@
+import json
+import re
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from functools import partial
+
+import openai
+from tenacity import (
+    retry,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_random_exponential,
+)
+
+
+# 各模型默认的并发请求数、每分钟请求数（RPM）上限与单次请求的上下文 token 预算
+MODEL_LIMITS = {
+    "Qwen/Qwen2-7B-Instruct": {"concurrency": 16, "rpm": 1000, "context": 32768},
+    "THUDM/glm-4-9b-chat": {"concurrency": 16, "rpm": 1000, "context": 32768},
+    "01-ai/Yi-1.5-6B-Chat": {"concurrency": 16, "rpm": 1000, "context": 4096},
+    "meta-llama/Meta-Llama-3-70B-Instruct": {"concurrency": 8, "rpm": 300, "context": 8192},
+}
+DEFAULT_LIMITS = {"concurrency": 8, "rpm": 300, "context": 8192}
+
+# 每篇总结预留的输出 token 数，以及单批最多合并的文章数
+SUMMARY_OUTPUT_TOKENS = 512
+MAX_BATCH_SIZE = 10
+
+
+def get_model_limits(model):
+    return MODEL_LIMITS.get(model, DEFAULT_LIMITS)
+
+
+SUMMARY_PROMPT = "你是一名IS领域的教授。请根据学生发送的文章题目和摘要，帮助总结文章的内容。要求：不要产生幻觉；使用中文；你需要返回字符串格式的总结的内容；"
+
+
+def complete(client, model, messages, temperature=0.5, stats=None, on_token=None):
+    """以流式方式请求一次对话补全并返回完整文本
+
+    传入 stats 字典时写入首 token 延迟（ttft）与 prompt/completion token 数；
+    服务端不返回 usage 时按 estimate_tokens 估算。传入 on_token 时，
+    每收到新内容就以当前已生成的全部文本调用一次。
+    """
+    start = time.monotonic()
+    stream = client.chat.completions.create(
+        model=model,
+        messages=messages,
+        temperature=temperature,
+        stream=True,
+        stream_options={"include_usage": True},
+    )
+    text = ""
+    usage = None
+    for chunk in stream:
+        if chunk.usage is not None:
+            usage = chunk.usage
+        if not chunk.choices or not chunk.choices[0].delta.content:
+            continue
+        if not text and stats is not None:
+            stats["ttft"] = time.monotonic() - start
+        text += chunk.choices[0].delta.content
+        if on_token is not None:
+            on_token(text)
+
+    if stats is not None:
+        if usage is not None:
+            stats["prompt_tokens"] = usage.prompt_tokens
+            stats["completion_tokens"] = usage.completion_tokens
+        else:
+            stats["prompt_tokens"] = sum(estimate_tokens(m["content"]) for m in messages)
+            stats["completion_tokens"] = estimate_tokens(text)
+    return text
+
+
+def make_summarizer(client, model, temperature=0.5):
+    def summary_article_by_abstract(title, abstract, stats=None, on_token=None):
+        messages = [
+            {"role": "system", "content": SUMMARY_PROMPT},
+            {"role": "user", "content": f"文章名称：{title}；\n文章摘要：{abstract}；"},
+        ]
+        return complete(client, model, messages, temperature=temperature,
+                        stats=stats, on_token=on_token)
+
+    return summary_article_by_abstract
+
+
+BATCH_PROMPT = "你是一名IS领域的教授。学生会发送多篇文章的编号、题目和摘要（JSON 数组），请分别总结每篇文章的内容。要求：不要产生幻觉；使用中文；只返回 JSON 数组，格式为 [{\"id\": 编号, \"summary\": \"总结内容\"}]，不要输出其他内容；"
+
+
+def make_batch_summarizer(client, model, temperature=0.5):
+    def summary_articles_in_batch(papers, stats=None):
+        messages = [
+            {"role": "system", "content": BATCH_PROMPT},
+            {"role": "user", "content": json.dumps(papers, ensure_ascii=False)},
+        ]
+        return complete(client, model, messages, temperature=temperature, stats=stats)
+
+    return summary_articles_in_batch
+
+
+def estimate_tokens(text):
+    # 粗略估计：中日韩字符约 1 token/字，其余约 4 字符/token
+    text = str(text)
+    cjk = len(re.findall(r"[\u3000-\u9fff\uac00-\ud7af\uff00-\uffef]", text))
+    return cjk + (len(text) - cjk) // 4 + 1
+
+
+def pack_batches(rows, context_tokens, max_batch_size=MAX_BATCH_SIZE):
+    """按 token 预算把 (index, title, abstract) 打包成批，每批输入加预留输出不超过预算"""
+    budget = context_tokens - estimate_tokens(BATCH_PROMPT)
+    batch, used = [], 0
+    for row in rows:
+        cost = estimate_tokens(row[1]) + estimate_tokens(row[2]) + 16 + SUMMARY_OUTPUT_TOKENS
+        if batch and (used + cost > budget or len(batch) >= max_batch_size):
+            yield batch
+            batch, used = [], 0
+        batch.append(row)
+        used += cost
+    if batch:
+        yield batch
+
+
+def parse_batch_response(text):
+    """解析批量请求返回的 JSON 数组，得到 {id: summary}；格式错误的条目被忽略"""
+    text = str(text).strip()
+    start, end = text.find("["), text.rfind("]")
+    if start == -1 or end <= start:
+        return {}
+    try:
+        items = json.loads(text[start:end + 1])
+    except json.JSONDecodeError:
+        return {}
+    results = {}
+    for item in items if isinstance(items, list) else []:
+        if not isinstance(item, dict):
+            continue
+        summary = item.get("summary")
+        try:
+            index = int(item.get("id"))
+        except (TypeError, ValueError):
+            continue
+        if isinstance(summary, str) and summary.strip():
+            results[index] = summary.strip()
+    return results
+
+
+class RateLimiter:
+    """按固定间隔发放请求时隙，使整体速率不超过 rpm"""
+
+    def __init__(self, rpm=None):
+        self.interval = 60.0 / rpm if rpm else 0.0
+        self.next_slot = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        if not self.interval:
+            return
+        with self.lock:
+            now = time.monotonic()
+            wait = self.next_slot - now
+            self.next_slot = max(now, self.next_slot) + self.interval
+        if wait > 0:
+            time.sleep(wait)
+
+
+def is_retryable(exc):
+    # 429 限流、5xx 服务端错误以及网络/超时错误可以重试
+    if isinstance(exc, (openai.RateLimitError, openai.APIConnectionError)):
+        return True
+    if isinstance(exc, openai.APIStatusError):
+        return exc.status_code >= 500
+    return False
+
+
+def summarize_rows(summarize, rows, concurrency=8, rpm=None, max_attempts=5,
+                   cache=None, key_of=None, refresh=False,
+                   batch_summarize=None, batch_key_of=None, context_tokens=None, max_batch_size=MAX_BATCH_SIZE,
+                   metrics=None, on_token=None):
+    """并发总结多篇文章
+
+    rows 为 (index, title, abstract) 的序列；按完成顺序产出 (index, summary, error)，
+    调用方可根据 index 还原原始行顺序。传入 cache 与 key_of(title, abstract) 时，
+    命中缓存的行直接返回，不发起 API 请求；refresh 为 True 时忽略已有缓存。
+    传入 batch_summarize 与 context_tokens 时，多篇文章按 token 预算合并为一次请求，
+    批量结果中缺失或格式错误的文章会回退为单篇请求。批量结果以 batch_key_of(title, abstract)
+    （由 BATCH_PROMPT 计算的键）写入缓存，未传入时不缓存批量结果；批量模式下查询缓存时两种键都会尝试。
+    传入 metrics（metrics.Metrics）时记录每次请求的排队、首 token、总耗时、token 数与重试次数。
+    传入 on_token(index, text) 时，单篇请求生成过程中的文本会被实时回调，便于逐字渲染。
+    """
+    limiter = RateLimiter(rpm)
+
+    batched = batch_summarize is not None and bool(context_tokens)
+
+    pending = []
+    for index, title, abstract in rows:
+        if cache is not None and not refresh:
+            keys = [key_of(title, abstract)]
+            if batched and batch_key_of is not None:
+                keys.append(batch_key_of(title, abstract))
+            summary = cache.get_any(keys)
+            if summary is not None:
+                yield index, summary, None
+                continue
+        pending.append((index, title, abstract))
+
+    retrying = retry(
+        retry=retry_if_exception(is_retryable),
+        wait=wait_random_exponential(multiplier=1, max=30),
+        stop=stop_after_attempt(max_attempts),
+        reraise=True,
+    )
+
+    @retrying
+    def attempt(fn, args, kwargs, stats, submitted):
+        limiter.acquire()
+        stats["attempts"] += 1
+        if "queue_wait" not in stats:
+            stats["queue_wait"] = time.monotonic() - submitted
+            stats["sent"] = time.monotonic()
+        return fn(*args, stats=stats, **kwargs)
+
+    def instrumented(kind, fn, args, rows, submitted, **kwargs):
+        # submitted 为提交到线程池时的时间，排队耗时包含在线程池队列中等待的时间
+        stats = {"kind": kind, "rows": rows, "attempts": 0,
+                 "submitted_at": time.time() - (time.monotonic() - submitted)}
+        ok = False
+        try:
+            result = attempt(fn, args, kwargs, stats, submitted)
+            ok = True
+            return result
+        finally:
+            stats["ok"] = ok
+            stats["latency"] = time.monotonic() - stats.pop("sent", submitted)
+            stats["finished_at"] = time.time()
+            if metrics is not None:
+                metrics.record(stats)
+
+    def call(submitted, index, title, abstract):
+        if on_token is None:
+            return instrumented("single", summarize, (title, abstract), 1, submitted)
+        return instrumented("single", summarize, (title, abstract), 1, submitted,
+                            on_token=partial(on_token, index))
+
+    def call_batch(submitted, batch):
+        papers = [
+            {"id": index, "title": str(title), "abstract": str(abstract)}
+            for index, title, abstract in batch
+        ]
+        return parse_batch_response(instrumented("batch", batch_summarize, (papers,), len(batch), submitted))
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        futures = {}
+
+        def submit_single(item):
+            futures[executor.submit(call, time.monotonic(), *item)] = [item]
+
+        if not batched:
+            for item in pending:
+                submit_single(item)
+        else:
+            for batch in pack_batches(pending, context_tokens, max_batch_size):
+                if len(batch) == 1:
+                    submit_single(batch[0])
+                else:
+                    futures[executor.submit(call_batch, time.monotonic(), batch)] = batch
+
+        while futures:
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                items = futures.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    if len(items) > 1:
+                        for item in items:
+                            submit_single(item)
+                    else:
+                        yield items[0][0], None, e
+                    continue
+
+                # 缓存键对应实际生成该总结的系统提示词
+                if len(items) == 1:
+                    result = {items[0][0]: result}
+                    cache_key_of = key_of
+                else:
+                    cache_key_of = batch_key_of
+                for item in items:
+                    index, title, abstract = item
+                    if index not in result:
+                        submit_single(item)
+                        continue
+                    if cache is not None and cache_key_of is not None:
+                        cache.set(cache_key_of(title, abstract), result[index])
+                    yield index, result[index], None